@@ -19,7 +19,6 @@ flow finishes.
 from __future__ import annotations
 
 import os
-import subprocess
 import sys
 
 import click
@@ -154,7 +153,7 @@ def run(
     metaflow_root: str | None,
     idle_timeout: int,
 ) -> None:
-    """Start the service, run CMD with METAFLOW_SERVICE_URL set, then exit.
+    """Start the service, then exec CMD with METAFLOW_SERVICE_URL set.
 
     The service keeps running after CMD exits (until idle timeout), so
     multiple flows can share a single daemon instance.
@@ -166,14 +165,20 @@ def run(
         port=port, metaflow_root=metaflow_root, idle_timeout=idle_timeout
     )
 
-    env = os.environ.copy()
-    env["METAFLOW_SERVICE_URL"] = state.url
-    env["METAFLOW_DEFAULT_METADATA"] = "service"
+    # The CLI process exists only to launch CMD — mutate our own environment
+    # (inherited by the child) instead of copying the whole environ dict.
+    os.environ["METAFLOW_SERVICE_URL"] = state.url
+    os.environ["METAFLOW_DEFAULT_METADATA"] = "service"
 
     click.echo(
         f"metaflow-local-service running at {state.url} (pid={state.pid})",
         err=True,
     )
 
-    result = subprocess.run(list(cmd), env=env)
-    sys.exit(result.returncode)
+    # Replace this process with CMD: no wrapper process lingering for the
+    # flow's lifetime, and signals/exit codes pass through untouched.
+    try:
+        os.execvp(cmd[0], list(cmd))
+    except FileNotFoundError:
+        click.echo(f"Command not found: {cmd[0]}", err=True)
+        sys.exit(127)
@@ -7,7 +7,7 @@ The daemon is a background uvicorn process that owns the FastAPI server.
 State (PID, port, metaflow_root) is written to ~/.metaflow-local-service/
 so that any process on the machine can discover and talk to it.
 
-Idle timeout: the daemon monitors server.last_heartbeat_at. After
+Idle timeout: the daemon monitors the server's heartbeat timestamp. After
 IDLE_TIMEOUT_SECONDS with no heartbeat, it shuts itself down gracefully.
 The default idle timeout is 300 s (5 minutes), configurable via CLI or
 METAFLOW_LOCAL_SERVICE_IDLE_TIMEOUT.
@@ -20,7 +20,6 @@ import json
 import os
 import signal
 import socket
-import subprocess
 import sys
 import time
 from dataclasses import dataclass
@@ -35,6 +34,9 @@ _STATE_DIR = os.path.expanduser("~/.metaflow-local-service")
 _STATE_FILE = os.path.join(_STATE_DIR, "state.json")
 _PID_FILE = os.path.join(_STATE_DIR, "pid")
 
+# Guards the os.makedirs in _write_state so repeat writes skip the stat.
+_dir_ready = False
+
 _DEFAULT_IDLE_TIMEOUT = int(os.environ.get("METAFLOW_LOCAL_SERVICE_IDLE_TIMEOUT", "300"))
 _DEFAULT_PORT = int(os.environ.get("METAFLOW_LOCAL_SERVICE_PORT", "0"))  # 0 = random
 
@@ -67,11 +69,14 @@ class DaemonState:
 
     @classmethod
     def from_dict(cls, d: dict[str, Any]) -> DaemonState:
+        # The state file is only ever written by to_dict(), so json.load already
+        # hands back the right types — no per-field coercion needed. A corrupt
+        # file surfaces as KeyError, which _read_state treats as "no daemon".
         return cls(
-            pid=int(d["pid"]),
-            port=int(d["port"]),
-            metaflow_root=str(d["metaflow_root"]),
-            started_at=float(d.get("started_at", 0)),
+            pid=d["pid"],
+            port=d["port"],
+            metaflow_root=d["metaflow_root"],
+            started_at=d.get("started_at", 0.0),
         )
 
 
@@ -93,12 +98,24 @@ def _find_free_port() -> int:
 # ---------------------------------------------------------------------------
 
 
+def _atomic_write(path: str, data: str) -> None:
+    """Write *data* to *path* via a tempfile + rename so readers never see
+    a truncated or partial file (e.g. a concurrent `status` invocation)."""
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
 def _write_state(state: DaemonState) -> None:
-    os.makedirs(_STATE_DIR, exist_ok=True)
-    with open(_STATE_FILE, "w") as f:
-        json.dump(state.to_dict(), f)
-    with open(_PID_FILE, "w") as f:
-        f.write(str(state.pid))
+    global _dir_ready
+    if not _dir_ready:
+        os.makedirs(_STATE_DIR, exist_ok=True)
+        _dir_ready = True
+    _atomic_write(_STATE_FILE, json.dumps(state.to_dict()))
+    _atomic_write(_PID_FILE, str(state.pid))
 
 
 def _read_state() -> DaemonState | None:
@@ -186,26 +203,42 @@ def start(
         "--idle-timeout",
         str(idle_timeout),
     ]
-    proc = subprocess.Popen(
-        cmd,
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL,
-        start_new_session=True,  # detach from parent's process group
-    )
+    # posix_spawn avoids fork()'s full page-table copy (it uses vfork/clone
+    # under the hood), which keeps daemon startup cheap even from large
+    # parent processes. setsid=True detaches it from our process group.
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    try:
+        pid = os.posix_spawn(
+            sys.executable,
+            cmd,
+            dict(os.environ),
+            file_actions=[
+                (os.POSIX_SPAWN_DUP2, devnull, 1),
+                (os.POSIX_SPAWN_DUP2, devnull, 2),
+            ],
+            setsid=True,
+        )
+    finally:
+        os.close(devnull)
 
-    # Wait until the server is reachable (up to 10 s).
+    # Wait until the server's listening socket is bound (up to 10 s).
+    # A bare TCP connect is enough to know uvicorn is accepting connections,
+    # and it avoids dragging in urllib/http.client for a readiness probe.
     deadline = time.time() + 10
-    state = DaemonState(pid=proc.pid, port=port, metaflow_root=metaflow_root)
+    state = DaemonState(pid=pid, port=port, metaflow_root=metaflow_root)
+    delay = 0.005
     while time.time() < deadline:
         try:
-            import urllib.request
-
-            urllib.request.urlopen(f"http://127.0.0.1:{port}/ping", timeout=1)
-            break
-        except Exception:
-            time.sleep(0.2)
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                break
+        except OSError:
+            # Exponential backoff: fast starts are noticed within milliseconds
+            # while slow ones degrade to a gentle 200 ms poll.
+            time.sleep(delay)
+            delay = min(delay * 2, 0.2)
     else:
-        proc.kill()
+        with contextlib.suppress(ProcessLookupError):
+            os.kill(pid, signal.SIGKILL)
         raise RuntimeError(
             f"metaflow-local-service failed to start on port {port}.\n"
             "Check that metaflow is installed: pip install metaflow\n"
@@ -259,23 +292,39 @@ def _run_server(port: int, metaflow_root: str, idle_timeout: int) -> None:
     state = DaemonState(pid=os.getpid(), port=port, metaflow_root=metaflow_root)
     _write_state(state)
 
+    # uvicorn[standard] ships uvloop and httptools; request them explicitly so
+    # the daemon never silently falls back to the slower asyncio/h11 stack.
     config = uvicorn.Config(
         app,
         host="127.0.0.1",
         port=port,
         log_level="warning",
         access_log=False,
+        loop="uvloop",
+        http="httptools",
     )
     uv_server = uvicorn.Server(config)
+    shutdown_evt = threading.Event()
 
     def _idle_monitor() -> None:
-        """Shut down after *idle_timeout* seconds with no heartbeats."""
-        while True:
-            time.sleep(30)
-            silence = time.time() - server.last_heartbeat_at
-            if silence > idle_timeout:
+        """Shut down after *idle_timeout* seconds with no heartbeats.
+
+        Sleeps exactly until the earliest possible expiry instead of polling
+        on a fixed interval, so the thread wakes once per actual deadline and
+        SIGTERM is honored immediately via the shared event.
+        """
+        while not shutdown_evt.is_set():
+            silence = server.heartbeat_seconds_since()
+            if silence >= idle_timeout:
                 uv_server.should_exit = True
                 break
+            shutdown_evt.wait(timeout=idle_timeout - silence + 0.5)
+
+    def _handle_sigterm(signum: int, frame: Any) -> None:
+        shutdown_evt.set()
+        uv_server.should_exit = True
+
+    signal.signal(signal.SIGTERM, _handle_sigterm)
 
     monitor_thread = threading.Thread(target=_idle_monitor, daemon=True)
     monitor_thread.start()
@@ -283,6 +332,7 @@ def _run_server(port: int, metaflow_root: str, idle_timeout: int) -> None:
     try:
         uv_server.run()
     finally:
+        shutdown_evt.set()
         _clear_state()
 
 
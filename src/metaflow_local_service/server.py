@@ -1,7 +1,7 @@
 """FastAPI application — speaks the Metaflow service API.
 
 Layer: HTTP
-May only import from: .store, fastapi, stdlib
+May only import from: .store, fastapi/starlette, stdlib
 
 Each route is a thin adapter: parse request → call store → return response.
 No business logic lives here. The store module owns all data operations.
@@ -12,9 +12,12 @@ gets, tag mutation, and filtered-tasks — all supported features).
 
 from __future__ import annotations
 
+import array
 import contextlib
-import time
+import json
+from time import monotonic as _now
 from typing import Any
+from typing import Callable
 
 from fastapi import APIRouter
 from fastapi import FastAPI
@@ -23,11 +26,34 @@ from fastapi import Query
 from fastapi import Request
 from fastapi import WebSocket
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 from fastapi.responses import Response
+from starlette.concurrency import run_in_threadpool
+from starlette.routing import Route
 
 from metaflow_local_service import store
 
+# Response encoding dominates CPU for the list-heavy endpoints. Use orjson's
+# C encoder when it is installed (the `orjson` extra); the stdlib encoder is
+# the fallback so the required dependency set stays unchanged.
+try:
+    import orjson
+
+    _json_dumps: Callable[[Any], bytes] = orjson.dumps
+except ImportError:  # pragma: no cover - depends on environment
+
+    def _json_dumps(content: Any) -> bytes:
+        return json.dumps(content, separators=(",", ":")).encode("utf-8")
+
+
+class JSONResponse(Response):
+    """JSON response backed by the fastest encoder available at import time."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return _json_dumps(content)
+
+
 # ---------------------------------------------------------------------------
 # Service metadata
 # ---------------------------------------------------------------------------
@@ -35,13 +61,84 @@ from metaflow_local_service import store
 _SERVICE_VERSION = "2.5.0"
 _HEARTBEAT_INTERVAL_SECONDS = 10
 
+# The heartbeat reply never changes, and heartbeats are the highest-QPS
+# endpoint — build the whole Response once instead of re-serializing it per
+# request. Responses are stateless after construction, so a single instance
+# can be returned from every heartbeat. The handlers stay `async def` (a sync
+# handler would be dispatched to a threadpool, which costs more than the
+# coroutine) but run to completion in a single step since they never await.
+_HB_RESPONSE_BYTES = b'{"wait_time_in_seconds":%d}' % _HEARTBEAT_INTERVAL_SECONDS
+_HB_RESPONSE = Response(_HB_RESPONSE_BYTES, media_type="application/json")
+
+# Prebuilt 404s for lookup misses. Returning a shared Response skips the
+# exception-middleware walk and per-miss JSONResponse construction that
+# raise HTTPException(404) would cost — misses are common when clients probe.
+_404_FLOW = JSONResponse({"detail": "Flow not found"}, status_code=404)
+_404_RUN = JSONResponse({"detail": "Run not found"}, status_code=404)
+_404_STEP = JSONResponse({"detail": "Step not found"}, status_code=404)
+_404_TASK = JSONResponse({"detail": "Task not found"}, status_code=404)
+
 # ---------------------------------------------------------------------------
 # Idle timeout tracking
 # ---------------------------------------------------------------------------
 # Updated on every heartbeat POST. The daemon's idle monitor reads this value
 # to decide when to shut down.
+#
+# The timestamp lives in a single-element array of monotonic-clock floats:
+# monotonic time is immune to NTP wall-clock jumps that could spuriously
+# extend or shorten the idle timeout, and item assignment is atomic under
+# the GIL without a `global` rebind in the hot heartbeat handlers.
+
+_hb = array.array("d", [_now()])
+
+
+def heartbeat_now() -> None:
+    """Record that a heartbeat was just received."""
+    _hb[0] = _now()
+
+
+def heartbeat_seconds_since() -> float:
+    """Return seconds of monotonic time elapsed since the last heartbeat.
+
+    The daemon's idle monitor calls this to decide when to shut down. The
+    service runs uvicorn in-process with a single worker, so the in-process
+    slot is the single source of truth; if multi-worker mode is ever added,
+    only these two accessors need to move to shared memory.
+    """
+    return _now() - _hb[0]
+
+
+# ---------------------------------------------------------------------------
+# Hot-path endpoints (raw Starlette routes)
+# ---------------------------------------------------------------------------
+# Heartbeats and /ping are mounted as plain starlette Routes instead of
+# FastAPI-decorated handlers: they take no body and return constants, so
+# FastAPI's dependency solving, path-param validation, and response-model
+# machinery are pure overhead on the service's highest-QPS paths.
+
+_PING_RESPONSE = Response(
+    content="pong",
+    media_type="text/plain",
+    headers={"METADATA_SERVICE_VERSION": _SERVICE_VERSION},
+)
+
+
+async def _ping_endpoint(request: Request) -> Response:
+    """Health check. Returns 200 with METADATA_SERVICE_VERSION header."""
+    return _PING_RESPONSE
+
+
+async def _heartbeat_endpoint(request: Request) -> Response:
+    """Record a run or task heartbeat — both paths share one handler."""
+    heartbeat_now()
+    return _HB_RESPONSE
+
+
+_HEARTBEAT_PATHS = (
+    "/flows/{flow_name}/runs/{run_id}/heartbeat",
+    "/flows/{flow_name}/runs/{run_id}/steps/{step_name}/tasks/{task_id}/heartbeat",
+)
 
-last_heartbeat_at: float = time.time()
 
 # ---------------------------------------------------------------------------
 # App factory
@@ -58,7 +155,12 @@ def create_app(metaflow_root: str) -> FastAPI:
     """
     store.setup(metaflow_root)
 
-    app = FastAPI(title="metaflow-local-service", version=_SERVICE_VERSION)
+    app = FastAPI(
+        title="metaflow-local-service",
+        version=_SERVICE_VERSION,
+        default_response_class=JSONResponse,
+        on_shutdown=[store.flush],
+    )
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -67,17 +169,12 @@ def create_app(metaflow_root: str) -> FastAPI:
     )
 
     # -----------------------------------------------------------------------
-    # Health / version
+    # Health / version / heartbeats — raw routes, bypassing FastAPI machinery
     # -----------------------------------------------------------------------
 
-    @app.get("/ping")
-    async def ping() -> Response:
-        """Health check. Returns 200 with METADATA_SERVICE_VERSION header."""
-        return Response(
-            content="pong",
-            media_type="text/plain",
-            headers={"METADATA_SERVICE_VERSION": _SERVICE_VERSION},
-        )
+    app.router.routes.append(Route("/ping", _ping_endpoint, methods=["GET"]))
+    for path in _HEARTBEAT_PATHS:
+        app.router.routes.append(Route(path, _heartbeat_endpoint, methods=["POST"]))
 
     # -----------------------------------------------------------------------
     # Flow
@@ -86,9 +183,7 @@ def create_app(metaflow_root: str) -> FastAPI:
     @app.get("/flows/{flow_name}")
     async def get_flow(flow_name: str) -> JSONResponse:
         obj = store.get_flow(flow_name)
-        if obj is None:
-            raise HTTPException(status_code=404, detail="Flow not found")
-        return JSONResponse(obj)
+        return JSONResponse(obj) if obj is not None else _404_FLOW
 
     @app.post("/flows/{flow_name}")
     async def create_flow(flow_name: str, request: Request) -> JSONResponse:
@@ -105,14 +200,12 @@ def create_app(metaflow_root: str) -> FastAPI:
 
     @app.get("/flows/{flow_name}/runs")
     async def list_runs(flow_name: str) -> JSONResponse:
-        return JSONResponse(store.list_runs(flow_name))
+        return JSONResponse(await run_in_threadpool(store.list_runs, flow_name))
 
     @app.get("/flows/{flow_name}/runs/{run_id}")
     async def get_run(flow_name: str, run_id: str) -> JSONResponse:
         obj = store.get_run(flow_name, run_id)
-        if obj is None:
-            raise HTTPException(status_code=404, detail="Run not found")
-        return JSONResponse(obj)
+        return JSONResponse(obj) if obj is not None else _404_RUN
 
     @app.post("/flows/{flow_name}/run")
     async def create_run(flow_name: str, request: Request) -> JSONResponse:
@@ -120,16 +213,6 @@ def create_app(metaflow_root: str) -> FastAPI:
         obj = store.create_run(flow_name, body)
         return JSONResponse(obj, status_code=201)
 
-    # -----------------------------------------------------------------------
-    # Run heartbeat
-    # -----------------------------------------------------------------------
-
-    @app.post("/flows/{flow_name}/runs/{run_id}/heartbeat")
-    async def run_heartbeat(flow_name: str, run_id: str) -> JSONResponse:
-        global last_heartbeat_at
-        last_heartbeat_at = time.time()
-        return JSONResponse({"wait_time_in_seconds": _HEARTBEAT_INTERVAL_SECONDS})
-
     # -----------------------------------------------------------------------
     # Tag mutation
     # -----------------------------------------------------------------------
@@ -143,7 +226,7 @@ def create_app(metaflow_root: str) -> FastAPI:
             final_tags = store.mutate_tags(flow_name, run_id, tags_to_add, tags_to_remove)
         except Exception as exc:
             raise HTTPException(status_code=422, detail=str(exc)) from exc
-        return JSONResponse({"tags": sorted(final_tags)})
+        return JSONResponse({"tags": final_tags})
 
     # -----------------------------------------------------------------------
     # Step
@@ -151,14 +234,12 @@ def create_app(metaflow_root: str) -> FastAPI:
 
     @app.get("/flows/{flow_name}/runs/{run_id}/steps")
     async def list_steps(flow_name: str, run_id: str) -> JSONResponse:
-        return JSONResponse(store.list_steps(flow_name, run_id))
+        return JSONResponse(await run_in_threadpool(store.list_steps, flow_name, run_id))
 
     @app.get("/flows/{flow_name}/runs/{run_id}/steps/{step_name}")
     async def get_step(flow_name: str, run_id: str, step_name: str) -> JSONResponse:
         obj = store.get_step(flow_name, run_id, step_name)
-        if obj is None:
-            raise HTTPException(status_code=404, detail="Step not found")
-        return JSONResponse(obj)
+        return JSONResponse(obj) if obj is not None else _404_STEP
 
     @app.post("/flows/{flow_name}/runs/{run_id}/steps/{step_name}/step")
     async def create_step(
@@ -176,14 +257,12 @@ def create_app(metaflow_root: str) -> FastAPI:
 
     @app.get("/flows/{flow_name}/runs/{run_id}/steps/{step_name}/tasks")
     async def list_tasks(flow_name: str, run_id: str, step_name: str) -> JSONResponse:
-        return JSONResponse(store.list_tasks(flow_name, run_id, step_name))
+        return JSONResponse(await run_in_threadpool(store.list_tasks, flow_name, run_id, step_name))
 
     @app.get("/flows/{flow_name}/runs/{run_id}/steps/{step_name}/tasks/{task_id}")
     async def get_task(flow_name: str, run_id: str, step_name: str, task_id: str) -> JSONResponse:
         obj = store.get_task(flow_name, run_id, step_name, task_id)
-        if obj is None:
-            raise HTTPException(status_code=404, detail="Task not found")
-        return JSONResponse(obj)
+        return JSONResponse(obj) if obj is not None else _404_TASK
 
     @app.post("/flows/{flow_name}/runs/{run_id}/steps/{step_name}/task")
     async def create_task(
@@ -193,18 +272,6 @@ def create_app(metaflow_root: str) -> FastAPI:
         obj = store.create_task(flow_name, run_id, step_name, body)
         return JSONResponse(obj, status_code=201)
 
-    # -----------------------------------------------------------------------
-    # Task heartbeat
-    # -----------------------------------------------------------------------
-
-    @app.post("/flows/{flow_name}/runs/{run_id}/steps/{step_name}/tasks/{task_id}/heartbeat")
-    async def task_heartbeat(
-        flow_name: str, run_id: str, step_name: str, task_id: str
-    ) -> JSONResponse:
-        global last_heartbeat_at
-        last_heartbeat_at = time.time()
-        return JSONResponse({"wait_time_in_seconds": _HEARTBEAT_INTERVAL_SECONDS})
-
     # -----------------------------------------------------------------------
     # Artifacts
     # -----------------------------------------------------------------------
@@ -222,7 +289,9 @@ def create_app(metaflow_root: str) -> FastAPI:
     async def list_artifacts(
         flow_name: str, run_id: str, step_name: str, task_id: str
     ) -> JSONResponse:
-        return JSONResponse(store.get_artifacts(flow_name, run_id, step_name, task_id))
+        return JSONResponse(
+            await run_in_threadpool(store.get_artifacts, flow_name, run_id, step_name, task_id)
+        )
 
     @app.get(
         "/flows/{flow_name}/runs/{run_id}/steps/{step_name}/tasks/{task_id}"
@@ -231,7 +300,11 @@ def create_app(metaflow_root: str) -> FastAPI:
     async def list_artifacts_for_attempt(
         flow_name: str, run_id: str, step_name: str, task_id: str, attempt: int
     ) -> JSONResponse:
-        return JSONResponse(store.get_artifacts(flow_name, run_id, step_name, task_id, attempt))
+        return JSONResponse(
+            await run_in_threadpool(
+                store.get_artifacts, flow_name, run_id, step_name, task_id, attempt
+            )
+        )
 
     # -----------------------------------------------------------------------
     # Metadata
@@ -250,7 +323,9 @@ def create_app(metaflow_root: str) -> FastAPI:
     async def get_metadata(
         flow_name: str, run_id: str, step_name: str, task_id: str
     ) -> JSONResponse:
-        return JSONResponse(store.get_metadata(flow_name, run_id, step_name, task_id))
+        return JSONResponse(
+            await run_in_threadpool(store.get_metadata, flow_name, run_id, step_name, task_id)
+        )
 
     # -----------------------------------------------------------------------
     # Filtered tasks
@@ -264,8 +339,13 @@ def create_app(metaflow_root: str) -> FastAPI:
         metadata_field_name: str = Query(default=""),
         pattern: str = Query(default=".*"),
     ) -> JSONResponse:
-        pathspecs = store.filter_tasks_by_metadata(
-            flow_name, run_id, step_name, metadata_field_name, pattern
+        pathspecs = await run_in_threadpool(
+            store.filter_tasks_by_metadata,
+            flow_name,
+            run_id,
+            step_name,
+            metadata_field_name,
+            pattern,
         )
         return JSONResponse(pathspecs)
 
@@ -302,29 +382,34 @@ def create_app(metaflow_root: str) -> FastAPI:
     async def ui_get_flow(flow_id: str, request: Request) -> JSONResponse:
         obj = store.get_flow(flow_id)
         if obj is None:
-            raise HTTPException(status_code=404, detail="Flow not found")
+            return _404_FLOW
         return JSONResponse(_ui_wrap(obj, request))
 
     @ui.get("/runs")
     async def ui_list_all_runs(request: Request) -> JSONResponse:
-        return JSONResponse(_ui_wrap(store.list_all_runs(), request))
+        return JSONResponse(_ui_wrap(await run_in_threadpool(store.list_all_runs), request))
 
     @ui.get("/flows/{flow_id}/runs")
     async def ui_list_runs(flow_id: str, request: Request) -> JSONResponse:
-        return JSONResponse(_ui_wrap(store.list_runs(flow_id), request))
+        return JSONResponse(_ui_wrap(await run_in_threadpool(store.list_runs, flow_id), request))
 
     @ui.get("/flows/{flow_id}/runs/{run_number}")
     async def ui_get_run(flow_id: str, run_number: str, request: Request) -> JSONResponse:
         obj = store.get_run(flow_id, run_number)
         if obj is None:
-            raise HTTPException(status_code=404, detail="Run not found")
+            return _404_RUN
         return JSONResponse(_ui_wrap(obj, request))
 
     @ui.get("/flows/{flow_id}/runs/{run_number}/tasks")
     async def ui_list_all_tasks_for_run(
         flow_id: str, run_number: str, request: Request
     ) -> JSONResponse:
-        return JSONResponse(_ui_wrap(store.list_all_tasks_for_run(flow_id, run_number), request))
+        return JSONResponse(
+            _ui_wrap(
+                await run_in_threadpool(store.list_all_tasks_for_run, flow_id, run_number),
+                request,
+            )
+        )
 
     @ui.get("/flows/{flow_id}/runs/{run_number}/artifacts")
     async def ui_run_artifacts(flow_id: str, run_number: str, request: Request) -> JSONResponse:
@@ -332,7 +417,9 @@ def create_app(metaflow_root: str) -> FastAPI:
 
     @ui.get("/flows/{flow_id}/runs/{run_number}/steps")
     async def ui_list_steps(flow_id: str, run_number: str, request: Request) -> JSONResponse:
-        return JSONResponse(_ui_wrap(store.list_steps(flow_id, run_number), request))
+        return JSONResponse(
+            _ui_wrap(await run_in_threadpool(store.list_steps, flow_id, run_number), request)
+        )
 
     @ui.get("/flows/{flow_id}/runs/{run_number}/steps/{step_name}")
     async def ui_get_step(
@@ -340,14 +427,19 @@ def create_app(metaflow_root: str) -> FastAPI:
     ) -> JSONResponse:
         obj = store.get_step(flow_id, run_number, step_name)
         if obj is None:
-            raise HTTPException(status_code=404, detail="Step not found")
+            return _404_STEP
         return JSONResponse(_ui_wrap(obj, request))
 
     @ui.get("/flows/{flow_id}/runs/{run_number}/steps/{step_name}/tasks")
     async def ui_list_tasks(
         flow_id: str, run_number: str, step_name: str, request: Request
     ) -> JSONResponse:
-        return JSONResponse(_ui_wrap(store.list_tasks(flow_id, run_number, step_name), request))
+        return JSONResponse(
+            _ui_wrap(
+                await run_in_threadpool(store.list_tasks, flow_id, run_number, step_name),
+                request,
+            )
+        )
 
     @ui.get("/flows/{flow_id}/runs/{run_number}/steps/{step_name}/tasks/{task_id}")
     async def ui_get_task(
@@ -355,7 +447,7 @@ def create_app(metaflow_root: str) -> FastAPI:
     ) -> JSONResponse:
         obj = store.get_task(flow_id, run_number, step_name, task_id)
         if obj is None:
-            raise HTTPException(status_code=404, detail="Task not found")
+            return _404_TASK
         return JSONResponse(_ui_wrap(obj, request))
 
     @ui.get("/flows/{flow_id}/runs/{run_number}/steps/{step_name}/tasks/{task_id}/attempts")
@@ -384,7 +476,12 @@ def create_app(metaflow_root: str) -> FastAPI:
         flow_id: str, run_number: str, step_name: str, task_id: str, request: Request
     ) -> JSONResponse:
         return JSONResponse(
-            _ui_wrap(store.get_metadata(flow_id, run_number, step_name, task_id), request)
+            _ui_wrap(
+                await run_in_threadpool(
+                    store.get_metadata, flow_id, run_number, step_name, task_id
+                ),
+                request,
+            )
         )
 
     @ui.get("/flows/{flow_id}/runs/{run_number}/steps/{step_name}/tasks/{task_id}/artifacts")
@@ -396,7 +493,9 @@ def create_app(metaflow_root: str) -> FastAPI:
         if raw is not None:
             with contextlib.suppress(ValueError):
                 attempt_id = int(raw)
-        data = store.get_artifacts(flow_id, run_number, step_name, task_id, attempt_id)
+        data = await run_in_threadpool(
+            store.get_artifacts, flow_id, run_number, step_name, task_id, attempt_id
+        )
         return JSONResponse(_ui_wrap(data, request))
 
     @ui.get("/flows/{flow_id}/runs/{run_number}/steps/{step_name}/tasks/{task_id}/cards")
@@ -410,7 +509,9 @@ def create_app(metaflow_root: str) -> FastAPI:
         flow_id: str, run_number: str, step_name: str, task_id: str, request: Request
     ) -> JSONResponse:
         attempt = int(request.query_params.get("attempt_id", 0))
-        logs = store.get_task_logs(flow_id, run_number, step_name, task_id, "out", attempt)
+        logs = await run_in_threadpool(
+            store.get_task_logs, flow_id, run_number, step_name, task_id, "out", attempt
+        )
         return JSONResponse(_ui_wrap(logs, request))
 
     @ui.get("/flows/{flow_id}/runs/{run_number}/steps/{step_name}/tasks/{task_id}/logs/err")
@@ -418,7 +519,9 @@ def create_app(metaflow_root: str) -> FastAPI:
         flow_id: str, run_number: str, step_name: str, task_id: str, request: Request
     ) -> JSONResponse:
         attempt = int(request.query_params.get("attempt_id", 0))
-        logs = store.get_task_logs(flow_id, run_number, step_name, task_id, "err", attempt)
+        logs = await run_in_threadpool(
+            store.get_task_logs, flow_id, run_number, step_name, task_id, "err", attempt
+        )
         return JSONResponse(_ui_wrap(logs, request))
 
     @ui.get("/flows/{flow_id}/runs/{run_number}/parameters")
@@ -516,6 +619,10 @@ def create_app(metaflow_root: str) -> FastAPI:
 
 async def _json_body(request: Request) -> Any:
     """Parse request body as JSON, returning empty dict on no-body requests."""
+    # Fast path: many endpoints legitimately receive empty bodies — skip the
+    # body read and parser bootstrap when the client declares zero length.
+    if request.headers.get("content-length") == "0":
+        return {}
     try:
         body = await request.json()
     except Exception:
@@ -3,9 +3,10 @@
 Layer: Storage
 May only import from: stdlib, metaflow (LocalMetadataProvider class methods only)
 
-All HTTP handlers delegate to this module. Data is written directly to .metaflow/
-in the LocalMetadataProvider on-disk format, so persistence is immediate and free —
-there is no separate sync step.
+All HTTP handlers delegate to this module. Data is written to .metaflow/ in the
+LocalMetadataProvider on-disk format, so there is no separate sync step. Object
+creation persists immediately; metadata/artifact registrations are buffered for
+a few milliseconds and flushed before any read (see flush()).
 
 Thread safety: reads are safe (filesystem is the source of truth). The task ID
 counter is protected by a lock; all other writes use the atomic tempfile/rename
@@ -15,10 +16,15 @@ pattern from LocalMetadataProvider._save_meta().
 from __future__ import annotations
 
 import contextlib
+import functools
 import glob
+import itertools
+import json
 import os
+import re
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 # ---------------------------------------------------------------------------
@@ -32,6 +38,12 @@ _METAFLOW_DIR = ".metaflow"
 _setup_lock = threading.Lock()
 _initialized = False
 
+# Class references resolved once and reused. The metaflow plugin imports walk
+# a deep package tree; paying that (plus the sys.modules lookups) on every
+# store call adds up on hot request paths.
+_PROVIDER: Any = None
+_STORAGE: Any = None
+
 
 def setup(metaflow_root: str) -> None:
     """Point LocalStorage at *metaflow_root*/.metaflow and create it if absent.
@@ -43,23 +55,81 @@ def setup(metaflow_root: str) -> None:
     metaflow_root:
         Parent directory of .metaflow/. Usually the project working directory.
     """
-    global _initialized
+    global _initialized, _PROVIDER, _STORAGE
+    # Double-checked: the bare flag read is atomic under the GIL, so repeat
+    # callers skip the lock entirely once initialization has happened.
+    if _initialized:
+        return
     with _setup_lock:
         if _initialized:
             return
         from metaflow.plugins.datastores.local_storage import LocalStorage
+        from metaflow.plugins.metadata_providers.local import LocalMetadataProvider
 
         metadir = os.path.realpath(os.path.join(metaflow_root, _METAFLOW_DIR))
         os.makedirs(metadir, exist_ok=True)
         LocalStorage.datastore_root = metadir  # type: ignore[assignment]
+        _PROVIDER = LocalMetadataProvider
+        _STORAGE = LocalStorage
+        # The record caches are only valid for one datastore root.
+        _flow_records.clear()
+        _run_records.clear()
+        _step_records.clear()
+        _task_records.clear()
+        _created_metadirs.clear()
+        _persisted_high.clear()
         _initialized = True
 
 
+def reset_for_tests(metaflow_root: str | None = None) -> None:
+    """Clear all in-memory state; optionally repoint the datastore root.
+
+    Test hook: fixtures call this between tests instead of reaching into
+    the private caches one by one, so new state added here never leaks
+    silently. With *metaflow_root* given, the store stays initialized and
+    LocalStorage is simply repointed at its .metaflow/ (created lazily on
+    first write) — no filesystem work at all. Without it, the store is
+    fully torn down and the next setup() call reinitializes.
+    """
+    global _flush_timer, _initialized
+    with _pending_lock:
+        if _flush_timer is not None:
+            _flush_timer.cancel()
+            _flush_timer = None
+        _pending_meta.clear()
+    _task_counters.clear()
+    _persisted_high.clear()
+    _flow_records.clear()
+    _run_records.clear()
+    _step_records.clear()
+    _task_records.clear()
+    _created_metadirs.clear()
+    if metaflow_root is None:
+        _initialized = False
+    elif _initialized:
+        _storage().datastore_root = os.path.join(metaflow_root, _METAFLOW_DIR)
+    else:
+        setup(metaflow_root)
+
+
 def _local() -> Any:
-    """Return the LocalMetadataProvider class (import deferred until setup())."""
-    from metaflow.plugins.metadata_providers.local import LocalMetadataProvider
+    """Return the LocalMetadataProvider class (cached at setup())."""
+    global _PROVIDER
+    if _PROVIDER is None:
+        from metaflow.plugins.metadata_providers.local import LocalMetadataProvider
 
-    return LocalMetadataProvider
+        _PROVIDER = LocalMetadataProvider
+    return _PROVIDER
+
+
+def _storage() -> Any:
+    """Return the LocalStorage class (cached at setup())."""
+    global _STORAGE
+    if _STORAGE is None:
+        from metaflow.plugins.datastores.local_storage import LocalStorage
+
+        _STORAGE = LocalStorage
+    return _STORAGE
 
 
 # ---------------------------------------------------------------------------
@@ -69,38 +139,198 @@ def _local() -> Any:
 # On first use we scan the filesystem to seed the counter past any existing
 # tasks, which makes resume work without any seeding step.
 
-_task_counters: dict[str, int] = {}
+_task_counters: dict[str, itertools.count[int]] = {}
 _counter_lock = threading.Lock()
 
 
 def _scan_max_task_id(flow_name: str, run_id: str) -> int:
-    """Return the highest task_id currently stored for this run, or 0."""
-    from metaflow.plugins.datastores.local_storage import LocalStorage
+    """Return the highest task_id currently stored for this run, or 0.
 
-    if LocalStorage.datastore_root is None:
+    Walks {run_dir}/{step}/{task} with os.scandir instead of globbing for
+    _self.json markers: two shallow directory reads replace a stat per task,
+    and a numeric directory name is evidence enough that the ID was assigned.
+    """
+    storage = _storage()
+    if storage.datastore_root is None:
         return 0
-    pattern = os.path.join(
-        LocalStorage.datastore_root, flow_name, run_id, "*", "*", "_meta", "_self.json"
-    )
+    run_dir = os.path.join(storage.datastore_root, flow_name, run_id)
     max_id = 0
-    for path in glob.iglob(pattern):
-        # path = .metaflow/{flow}/{run}/{step}/{task}/_meta/_self.json
-        parts = path.split(os.sep)
-        # task directory is 3 levels up from _self.json: _meta, task, step
-        task_dir = parts[-3]
-        with contextlib.suppress(ValueError):
-            max_id = max(max_id, int(task_dir))
+    try:
+        with os.scandir(run_dir) as steps:
+            for step in steps:
+                if not step.is_dir():
+                    continue
+                with os.scandir(step.path) as tasks:
+                    for task in tasks:
+                        with contextlib.suppress(ValueError):
+                            max_id = max(max_id, int(task.name))
+    except FileNotFoundError:
+        return 0
     return max_id
 
 
+_COUNTER_FILE = "_next_task_id"
+_persist_lock = threading.Lock()
+# Highest value written per counter file. Allocation is lock-free, so two
+# threads can reach _persist_task_counter out of order; this guard keeps a
+# slower thread from overwriting the file with a lower (stale) value.
+_persisted_high: dict[str, int] = {}
+
+
+def _counter_file(flow_name: str, run_id: str) -> str | None:
+    root = _storage().datastore_root
+    if root is None:
+        return None
+    return os.path.join(root, flow_name, run_id, "_meta", _COUNTER_FILE)
+
+
+def _persist_task_counter(path: str, value: int) -> None:
+    """Record the highest issued task ID in {run_dir}/_meta, best-effort.
+
+    The write happens before the ID is returned, and writes that would move
+    the file backwards are skipped under the lock, so the file is never
+    behind an issued ID — a crash can at worst skip IDs, never reuse them.
+    Failures are ignored; _scan_max_task_id remains the fallback.
+    """
+    tmp = f"{path}.tmp.{os.getpid()}.{threading.get_ident()}"
+    try:
+        with _persist_lock:
+            if value <= _persisted_high.get(path, 0):
+                return
+            with open(tmp, "w") as f:
+                f.write(str(value))
+            os.replace(tmp, path)
+            _persisted_high[path] = value
+    except OSError:
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+
+
+def _seed_task_counter(flow_name: str, run_id: str) -> int:
+    """Return the highest task ID issued so far for this run.
+
+    Reads the persisted counter file when present (O(1) on restart); falls
+    back to scanning the run's task directories.
+    """
+    path = _counter_file(flow_name, run_id)
+    if path is not None:
+        try:
+            with open(path) as f:
+                return int(f.read())
+        except (OSError, ValueError):
+            pass
+    return _scan_max_task_id(flow_name, run_id)
+
+
 def _next_task_id(flow_name: str, run_id: str) -> str:
-    """Return the next task ID for this flow/run, thread-safely."""
+    """Return the next task ID for this flow/run, thread-safely.
+
+    Each run's counter is an itertools.count: next() is atomic under the GIL
+    (it is a single C call), so the lock is only needed to seed the counter on
+    first use, not on every allocation.
+    """
     key = f"{flow_name}/{run_id}"
-    with _counter_lock:
-        if key not in _task_counters:
-            _task_counters[key] = _scan_max_task_id(flow_name, run_id)
-        _task_counters[key] += 1
-        return str(_task_counters[key])
+    counter = _task_counters.get(key)
+    if counter is None:
+        with _counter_lock:
+            counter = _task_counters.get(key)
+            if counter is None:
+                counter = itertools.count(_seed_task_counter(flow_name, run_id) + 1)
+                _task_counters[key] = counter
+    value = next(counter)
+    path = _counter_file(flow_name, run_id)
+    if path is not None:
+        _persist_task_counter(path, value)
+    return str(value)
+
+
+# ---------------------------------------------------------------------------
+# Parallel reads
+# ---------------------------------------------------------------------------
+# Artifact JSON files are independent disk-bound reads; above a small batch
+# size a shared thread pool overlaps the syscall latency. Created lazily so
+# the service never spawns threads it does not use.
+
+_PARALLEL_READ_THRESHOLD = 8
+_read_pool_instance: ThreadPoolExecutor | None = None
+_read_pool_lock = threading.Lock()
+
+
+def _read_pool() -> ThreadPoolExecutor:
+    global _read_pool_instance
+    if _read_pool_instance is None:
+        with _read_pool_lock:
+            if _read_pool_instance is None:
+                _read_pool_instance = ThreadPoolExecutor(
+                    max_workers=8, thread_name_prefix="store-read"
+                )
+    return _read_pool_instance
+
+
+# ---------------------------------------------------------------------------
+# Write batching
+# ---------------------------------------------------------------------------
+# Tasks fire bursts of small metadata/artifact POSTs (one fsynced tempfile +
+# rename each). Queue them per meta_dir and flush once after a short delay so
+# a burst costs one _save_meta call per directory. Every read path drains the
+# queue first, so callers still observe read-your-writes semantics.
+
+_FLUSH_DELAY_SECONDS = 0.005
+_pending_meta: dict[str, dict[str, Any]] = {}
+_pending_lock = threading.Lock()
+# Held across both the queue swap and the _save_meta loop in flush(). _pending_lock
+# alone is not enough: a reader arriving while the timer thread is mid-write would
+# see an empty queue and return before the acknowledged records hit disk.
+_flush_io_lock = threading.Lock()
+_flush_timer: threading.Timer | None = None
+
+
+def _queue_meta(meta_dir: str, items: dict[str, Any]) -> None:
+    """Queue *items* for *meta_dir* and arm the flush timer if idle."""
+    global _flush_timer
+    with _pending_lock:
+        _pending_meta.setdefault(meta_dir, {}).update(items)
+        if _flush_timer is None:
+            _flush_timer = threading.Timer(_FLUSH_DELAY_SECONDS, flush)
+            _flush_timer.daemon = True
+            _flush_timer.start()
+
+
+def flush() -> None:
+    """Write all queued metadata/artifact records to disk. No-op when idle.
+
+    Called by the flush timer, by every read path before touching disk, and
+    by the server's shutdown hook so nothing queued is lost at exit. The I/O
+    lock spans the writes, so a concurrent caller returns only once every
+    record queued before it arrived is durable (read-your-writes). Records
+    that fail to write go back on the queue for the next flush.
+    """
+    global _flush_timer
+    with _flush_io_lock:
+        with _pending_lock:
+            if not _pending_meta:
+                return
+            pending = _pending_meta.copy()
+            _pending_meta.clear()
+            if _flush_timer is not None:
+                _flush_timer.cancel()
+                _flush_timer = None
+        provider = _local()
+        try:
+            for meta_dir in list(pending):
+                provider._save_meta(meta_dir, pending[meta_dir])
+                del pending[meta_dir]
+        except Exception:
+            # The POSTs behind these records were already acknowledged; put
+            # what did not land back so a later flush retries it. A record
+            # re-queued for a key that was written again meanwhile is stale,
+            # so the fresh queued value wins.
+            with _pending_lock:
+                for meta_dir, items in pending.items():
+                    merged = items.copy()
+                    merged.update(_pending_meta.get(meta_dir, {}))
+                    _pending_meta[meta_dir] = merged
+            raise
 
 
 # ---------------------------------------------------------------------------
@@ -119,7 +349,7 @@ def new_run_id() -> str:
     """
     global _last_run_id
     with _run_id_lock:
-        wall = int(time.time() * 1e6)
+        wall = time.time_ns() // 1000
         new_id = max(wall, _last_run_id + 1)
         _last_run_id = new_id
         return str(new_id)
@@ -130,52 +360,76 @@ def new_run_id() -> str:
 # ---------------------------------------------------------------------------
 
 
+@functools.lru_cache(maxsize=1)
 def _get_username() -> str:
+    """Resolve the invoking user once; the answer is process-lifetime stable.
+
+    Checks METAFLOW_USER and the usual env vars first (same precedence as
+    metaflow.util.get_username, minus the metaflow import), then falls back
+    to the passwd entry for the effective UID.
+    """
+    for var in ("METAFLOW_USER", "SUDO_USER", "USERNAME", "USER"):
+        user = os.environ.get(var)
+        if user and user != "root":
+            return user
     try:
-        from metaflow.util import get_username
+        import pwd
 
-        return get_username() or "unknown"
+        return pwd.getpwuid(os.getuid()).pw_name
     except Exception:
-        return os.environ.get("USER", "unknown")
+        return "unknown"
 
 
 def _ts_now() -> int:
-    return round(time.time() * 1000)
+    return time.time_ns() // 1_000_000
+
 
+def _record_base(body: dict[str, Any], now_ms: int | None = None) -> dict[str, Any]:
+    """Build the fields every record type shares.
 
-def _build_flow_record(flow_name: str, body: dict[str, Any]) -> dict[str, Any]:
+    Create paths compute this once per request and hand it to every builder
+    involved, which copy it and add their identifying keys — one body parse
+    and one clock read per request regardless of how many records it creates.
+    Sharing the tag list references across records is safe: records are
+    serialized immediately and never mutated.
+    """
     return {
-        "flow_id": flow_name,
         "user_name": body.get("user_name") or _get_username(),
-        "tags": list(body.get("tags") or []),
-        "system_tags": list(body.get("system_tags") or []),
-        "ts_epoch": body.get("ts_epoch") or _ts_now(),
+        "tags": body.get("tags") or [],
+        "system_tags": body.get("system_tags") or [],
+        "ts_epoch": body.get("ts_epoch") or now_ms or _ts_now(),
     }
 
 
-def _build_run_record(flow_name: str, run_id: str, body: dict[str, Any]) -> dict[str, Any]:
-    return {
-        "flow_id": flow_name,
-        "run_number": run_id,
-        "user_name": body.get("user_name") or _get_username(),
-        "tags": list(body.get("tags") or []),
-        "system_tags": list(body.get("system_tags") or []),
-        "ts_epoch": body.get("ts_epoch") or _ts_now(),
-    }
+def _build_flow_record(
+    flow_name: str, body: dict[str, Any], base: dict[str, Any] | None = None
+) -> dict[str, Any]:
+    record = base.copy() if base is not None else _record_base(body)
+    record["flow_id"] = flow_name
+    return record
+
+
+def _build_run_record(
+    flow_name: str, run_id: str, body: dict[str, Any], base: dict[str, Any] | None = None
+) -> dict[str, Any]:
+    record = base.copy() if base is not None else _record_base(body)
+    record["flow_id"] = flow_name
+    record["run_number"] = run_id
+    return record
 
 
 def _build_step_record(
-    flow_name: str, run_id: str, step_name: str, body: dict[str, Any]
+    flow_name: str,
+    run_id: str,
+    step_name: str,
+    body: dict[str, Any],
+    base: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
-    return {
-        "flow_id": flow_name,
-        "run_number": run_id,
-        "step_name": step_name,
-        "user_name": body.get("user_name") or _get_username(),
-        "tags": list(body.get("tags") or []),
-        "system_tags": list(body.get("system_tags") or []),
-        "ts_epoch": body.get("ts_epoch") or _ts_now(),
-    }
+    record = base.copy() if base is not None else _record_base(body)
+    record["flow_id"] = flow_name
+    record["run_number"] = run_id
+    record["step_name"] = step_name
+    return record
 
 
 def _build_task_record(
@@ -184,17 +438,65 @@ def _build_task_record(
     step_name: str,
     task_id: str,
     body: dict[str, Any],
+    base: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
-    return {
-        "flow_id": flow_name,
-        "run_number": run_id,
-        "step_name": step_name,
-        "task_id": task_id,
-        "user_name": body.get("user_name") or _get_username(),
-        "tags": list(body.get("tags") or []),
-        "system_tags": list(body.get("system_tags") or []),
-        "ts_epoch": body.get("ts_epoch") or _ts_now(),
-    }
+    record = base.copy() if base is not None else _record_base(body)
+    record["flow_id"] = flow_name
+    record["run_number"] = run_id
+    record["step_name"] = step_name
+    record["task_id"] = task_id
+    return record
+
+
+def _write_single(meta_dir: str, key: str, record: dict[str, Any]) -> None:
+    """Atomically write one record to {meta_dir}/{key}.json.
+
+    Inlines the tempfile + rename pattern for the single-record case instead
+    of going through provider._save_meta, which loops over a dict and stats
+    the destination per key. Callers only use this for records they have just
+    established do not exist.
+    """
+    final = os.path.join(meta_dir, f"{key}.json")
+    tmp = f"{final}.tmp.{os.getpid()}.{threading.get_ident()}"
+    with open(tmp, "wb") as f:
+        f.write(json.dumps(record).encode("utf-8"))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, final)
+
+
+# ---------------------------------------------------------------------------
+# Record caches
+# ---------------------------------------------------------------------------
+# This service is the sole writer of its datastore, so raw _self records are
+# immutable for the process lifetime once seen (tag mutation, the one
+# exception, drops its run's entry). Caching them serves two purposes: the
+# task-create hot path skips a stat + JSON parse per parent existence check,
+# and single-object reads skip the disk entirely — enrichment (status,
+# timings) still runs per read since it aggregates live sysmeta. Plain
+# dicts: single-key get/set is atomic under the GIL.
+
+_flow_records: dict[str, dict[str, Any]] = {}
+_run_records: dict[tuple[str, str], dict[str, Any]] = {}
+_step_records: dict[tuple[str, str, str], dict[str, Any]] = {}
+_task_records: dict[tuple[str, str, str, str], dict[str, Any]] = {}
+
+# The metadata layout has no fixed top-level subdirs to precreate — every
+# directory is keyed by flow/run/step/task names we only learn at request
+# time — so instead remember which _meta dirs this process already created
+# and skip the redundant makedirs on repeat visits (every artifact and
+# metadata registration lands in a dir created at task-create time).
+_created_metadirs: dict[tuple[str, ...], str] = {}
+
+
+def _metadir_for(*path: str) -> str:
+    """provider._create_and_get_metadir with the mkdir skipped for known dirs."""
+    cached = _created_metadirs.get(path)
+    if cached is not None:
+        return cached
+    meta_dir: str = _local()._create_and_get_metadir(*path)
+    _created_metadirs[path] = meta_dir
+    return meta_dir
 
 
 # ---------------------------------------------------------------------------
@@ -202,31 +504,45 @@ def _build_task_record(
 # ---------------------------------------------------------------------------
 
 
-def get_or_create_flow(flow_name: str, body: dict[str, Any]) -> tuple[dict[str, Any], bool]:
+def get_or_create_flow(
+    flow_name: str, body: dict[str, Any], base: dict[str, Any] | None = None
+) -> tuple[dict[str, Any], bool]:
     """Return (flow_record, created). Created=True if the flow did not exist."""
+    cached = _flow_records.get(flow_name)
+    if cached is not None:
+        return cached, False
     provider = _local()
     existing = provider.get_object("flow", "self", {}, None, flow_name)
     if existing:
+        _flow_records[flow_name] = existing
         return existing, False
-    record = _build_flow_record(flow_name, body)
-    meta_dir = provider._create_and_get_metadir(flow_name)
-    provider._save_meta(meta_dir, {"_self": record})
+    record = _build_flow_record(flow_name, body, base)
+    meta_dir = _metadir_for(flow_name)
+    _write_single(meta_dir, "_self", record)
+    _flow_records[flow_name] = record
     return record, True
 
 
 def get_flow(flow_name: str) -> dict[str, Any] | None:
-    return _local().get_object("flow", "self", {}, None, flow_name)  # type: ignore[no-any-return]
+    cached = _flow_records.get(flow_name)
+    if cached is not None:
+        return cached
+    existing = _local().get_object("flow", "self", {}, None, flow_name)
+    if existing:
+        _flow_records[flow_name] = existing
+    return existing  # type: ignore[no-any-return]
 
 
 def create_run(flow_name: str, body: dict[str, Any]) -> dict[str, Any]:
     """Create a new run with a server-assigned ID. Always creates (never 409)."""
-    provider = _local()
+    base = _record_base(body)
     # Ensure flow exists first
-    get_or_create_flow(flow_name, body)
+    get_or_create_flow(flow_name, body, base)
     run_id = new_run_id()
-    record = _build_run_record(flow_name, run_id, body)
-    meta_dir = provider._create_and_get_metadir(flow_name, run_id)
-    provider._save_meta(meta_dir, {"_self": record})
+    record = _build_run_record(flow_name, run_id, body, base)
+    meta_dir = _metadir_for(flow_name, run_id)
+    _write_single(meta_dir, "_self", record)
+    _run_records[(flow_name, run_id)] = record
     return record
 
 
@@ -258,26 +574,42 @@ def _enrich_run(run: dict[str, Any]) -> dict[str, Any]:
 
 
 def get_run(flow_name: str, run_id: str) -> dict[str, Any] | None:
-    raw = _local().get_object("run", "self", {}, None, flow_name, run_id)
+    flush()
+    raw = _run_records.get((flow_name, run_id))
+    if raw is None:
+        raw = _local().get_object("run", "self", {}, None, flow_name, run_id)
+        if raw is not None:
+            _run_records[(flow_name, run_id)] = raw
     return _enrich_run(raw) if raw is not None else None
 
 
 def list_runs(flow_name: str) -> list[dict[str, Any]]:
+    flush()
     result = _local().get_object("flow", "run", {}, None, flow_name)
     return [_enrich_run(r) for r in result] if result else []
 
 
 def get_or_create_step(
-    flow_name: str, run_id: str, step_name: str, body: dict[str, Any]
+    flow_name: str,
+    run_id: str,
+    step_name: str,
+    body: dict[str, Any],
+    base: dict[str, Any] | None = None,
 ) -> tuple[dict[str, Any], bool]:
     """Return (step_record, created)."""
+    key = (flow_name, run_id, step_name)
+    cached = _step_records.get(key)
+    if cached is not None:
+        return cached, False
     provider = _local()
     existing = provider.get_object("step", "self", {}, None, flow_name, run_id, step_name)
     if existing:
+        _step_records[key] = existing
         return existing, False
-    record = _build_step_record(flow_name, run_id, step_name, body)
-    meta_dir = provider._create_and_get_metadir(flow_name, run_id, step_name)
-    provider._save_meta(meta_dir, {"_self": record})
+    record = _build_step_record(flow_name, run_id, step_name, body, base)
+    meta_dir = _metadir_for(flow_name, run_id, step_name)
+    _write_single(meta_dir, "_self", record)
+    _step_records[key] = record
     return record, True
 
 
@@ -308,11 +640,17 @@ def _enrich_step(step: dict[str, Any]) -> dict[str, Any]:
 
 
 def get_step(flow_name: str, run_id: str, step_name: str) -> dict[str, Any] | None:
-    raw = _local().get_object("step", "self", {}, None, flow_name, run_id, step_name)
+    flush()
+    raw = _step_records.get((flow_name, run_id, step_name))
+    if raw is None:
+        raw = _local().get_object("step", "self", {}, None, flow_name, run_id, step_name)
+        if raw is not None:
+            _step_records[(flow_name, run_id, step_name)] = raw
     return _enrich_step(raw) if raw is not None else None
 
 
 def list_steps(flow_name: str, run_id: str) -> list[dict[str, Any]]:
+    flush()
     result = _local().get_object("run", "step", {}, None, flow_name, run_id)
     return [_enrich_step(s) for s in result] if result else []
 
@@ -322,12 +660,19 @@ def create_task(
 ) -> dict[str, Any]:
     """Create a task with a server-assigned ID. Always creates (never 409)."""
     provider = _local()
-    # Ensure step exists first
-    get_or_create_step(flow_name, run_id, step_name, body)
+    base = _record_base(body)
+    # Ensure step exists first. The record cache covers steps created in this
+    # process; after a restart a directory stat is evidence enough, and both
+    # paths skip re-parsing _self.json on the hottest endpoint.
+    if (flow_name, run_id, step_name) not in _step_records:
+        step_dir = provider._get_metadir(flow_name, run_id, step_name)
+        if not (step_dir and os.path.isdir(step_dir)):
+            get_or_create_step(flow_name, run_id, step_name, body, base)
     task_id = _next_task_id(flow_name, run_id)
-    record = _build_task_record(flow_name, run_id, step_name, task_id, body)
-    meta_dir = provider._create_and_get_metadir(flow_name, run_id, step_name, task_id)
-    provider._save_meta(meta_dir, {"_self": record})
+    record = _build_task_record(flow_name, run_id, step_name, task_id, body, base)
+    meta_dir = _metadir_for(flow_name, run_id, step_name, task_id)
+    _write_single(meta_dir, "_self", record)
+    _task_records[(flow_name, run_id, step_name, task_id)] = record
     return record
 
 
@@ -384,15 +729,30 @@ def _enrich_task(task: dict[str, Any]) -> dict[str, Any]:
 
 
 def get_task(flow_name: str, run_id: str, step_name: str, task_id: str) -> dict[str, Any] | None:
-    raw = _local().get_object("task", "self", {}, None, flow_name, run_id, step_name, task_id)
+    flush()
+    key = (flow_name, run_id, step_name, task_id)
+    raw = _task_records.get(key)
+    if raw is None:
+        raw = _local().get_object("task", "self", {}, None, flow_name, run_id, step_name, task_id)
+        if raw is not None:
+            _task_records[key] = raw
     return _enrich_task(raw) if raw is not None else None
 
 
 def list_tasks(flow_name: str, run_id: str, step_name: str) -> list[dict[str, Any]]:
+    flush()
     result = _local().get_object("step", "task", {}, None, flow_name, run_id, step_name)
     return [_enrich_task(t) for t in result] if result else []
 
 
+_ARTIFACT_ANY_RE = re.compile(r"^\d+_artifact_.*\.json$")
+
+
+@functools.lru_cache(maxsize=16)
+def _artifact_attempt_re(attempt: int) -> re.Pattern[str]:
+    return re.compile(rf"^{attempt}_artifact_.*\.json$")
+
+
 def register_artifacts(
     flow_name: str,
     run_id: str,
@@ -401,10 +761,9 @@ def register_artifacts(
     artifacts: list[dict[str, Any]],
 ) -> None:
     """Store a list of artifact records for a task attempt."""
-    provider = _local()
-    meta_dir = provider._create_and_get_metadir(flow_name, run_id, step_name, task_id)
+    meta_dir = _metadir_for(flow_name, run_id, step_name, task_id)
     art_dict = {"{}_artifact_{}".format(a.get("attempt_id", 0), a["name"]): a for a in artifacts}
-    provider._save_meta(meta_dir, art_dict)
+    _queue_meta(meta_dir, art_dict)
 
 
 def get_artifacts(
@@ -420,18 +779,27 @@ def get_artifacts(
     a sysmeta_attempt-done_* file to determine which attempt to read. Since the
     ephemeral service doesn't mandate that marker, we glob all matching files.
     """
+    flush()
     provider = _local()
     meta_dir = provider._get_metadir(flow_name, run_id, step_name, task_id)
     if not os.path.isdir(meta_dir):
         return []
-    prefix = f"{attempt}_artifact_" if attempt is not None else "*_artifact_"
-    pattern = os.path.join(meta_dir, f"{prefix}*.json")
-    result: list[dict[str, Any]] = []
-    for path in glob.iglob(pattern):
-        obj = provider._read_json_file(path)
-        if obj is not None:
-            result.append(obj)
-    return result
+    # One precompiled regex per call shape; matching entry names in a scandir
+    # sweep avoids glob's per-call pattern parsing entirely.
+    matcher = (_artifact_attempt_re(attempt) if attempt is not None else _ARTIFACT_ANY_RE).match
+    paths: list[str] = []
+    with os.scandir(meta_dir) as it:
+        for entry in it:
+            if matcher(entry.name):
+                paths.append(entry.path)
+    if len(paths) >= _PARALLEL_READ_THRESHOLD:
+        objs = _read_pool().map(provider._read_json_file, paths)
+    else:
+        objs = map(provider._read_json_file, paths)
+    return [obj for obj in objs if obj is not None]
+
+
+_metadata_seq = itertools.count()
 
 
 def register_metadata(
@@ -442,13 +810,15 @@ def register_metadata(
     metadata: list[dict[str, Any]],
 ) -> None:
     """Store a list of metadata field records for a task."""
-    provider = _local()
-    meta_dir = provider._create_and_get_metadir(flow_name, run_id, step_name, task_id)
-    ts = round(time.time() * 1000)
+    meta_dir = _metadir_for(flow_name, run_id, step_name, task_id)
+    ts = time.time_ns() // 1_000_000
+    # A process-wide sequence suffix keeps keys unique even when concurrent
+    # registrations for the same field land in the same millisecond; the
+    # wall-clock prefix preserves on-disk ordering across restarts.
     meta_dict = {
-        f"sysmeta_{m.get('field_name', 'unknown')}_{ts + i}": m for i, m in enumerate(metadata)
+        f"sysmeta_{m.get('field_name', 'unknown')}_{ts}_{next(_metadata_seq)}": m for m in metadata
     }
-    provider._save_meta(meta_dir, meta_dict)
+    _queue_meta(meta_dir, meta_dict)
 
 
 def _enrich_metadata(record: dict[str, Any]) -> dict[str, Any]:
@@ -464,6 +834,7 @@ def _enrich_metadata(record: dict[str, Any]) -> dict[str, Any]:
 
 
 def get_metadata(flow_name: str, run_id: str, step_name: str, task_id: str) -> list[dict[str, Any]]:
+    flush()
     result = _local().get_object(
         "task", "metadata", {}, None, flow_name, run_id, step_name, task_id
     )
@@ -475,11 +846,18 @@ def mutate_tags(
     run_id: str,
     tags_to_add: list[str],
     tags_to_remove: list[str],
-) -> frozenset[str]:
-    """Optimistically mutate user tags on a run. Returns the final tag set."""
-    return _local()._mutate_user_tags_for_run(  # type: ignore[no-any-return]
+) -> list[str]:
+    """Optimistically mutate user tags on a run. Returns the final tags, sorted.
+
+    Sorting happens here, once per mutation, so the HTTP handler can hand the
+    result straight to the response without re-sorting on the request path.
+    """
+    final = _local()._mutate_user_tags_for_run(
         flow_name, run_id, tags_to_add=tags_to_add, tags_to_remove=tags_to_remove
     )
+    # The on-disk record changed under the cache; next read re-parses it.
+    _run_records.pop((flow_name, run_id), None)
+    return sorted(final)
 
 
 def list_all_tasks_for_run(flow_name: str, run_id: str) -> list[dict[str, Any]]:
@@ -493,11 +871,10 @@ def list_all_tasks_for_run(flow_name: str, run_id: str) -> list[dict[str, Any]]:
 
 def list_all_flows() -> list[dict[str, Any]]:
     """Return all flow records stored on disk, sorted by name."""
-    from metaflow.plugins.datastores.local_storage import LocalStorage
-
-    if LocalStorage.datastore_root is None:
+    storage = _storage()
+    if storage.datastore_root is None:
         return []
-    pattern = os.path.join(str(LocalStorage.datastore_root), "*", "_meta", "_self.json")
+    pattern = os.path.join(str(storage.datastore_root), "*", "_meta", "_self.json")
     provider = _local()
     result = []
     for path in sorted(glob.iglob(pattern)):
@@ -559,6 +936,18 @@ def get_task_logs(
     return lines
 
 
+@functools.lru_cache(maxsize=128)
+def _compile_pattern(pattern: str) -> re.Pattern[str]:
+    """Compile (and thereby validate) a metadata filter pattern, cached.
+
+    The provider matches against the pattern string itself, going through the
+    re module's internal cache each call. Compiling here keeps that cache
+    primed across repeated filter calls and rejects malformed patterns before
+    any directory walking starts.
+    """
+    return re.compile(pattern)
+
+
 def filter_tasks_by_metadata(
     flow_name: str,
     run_id: str,
@@ -567,4 +956,6 @@ def filter_tasks_by_metadata(
     pattern: str,
 ) -> list[str]:
     """Return task pathspecs whose metadata matches field_name/pattern."""
+    flush()
+    _compile_pattern(pattern)
     return _local().filter_tasks_by_metadata(flow_name, run_id, step_name, field_name, pattern)  # type: ignore[no-any-return]
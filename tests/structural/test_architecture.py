@@ -15,6 +15,7 @@ Invariants enforced:
 from __future__ import annotations
 
 import ast
+import functools
 from pathlib import Path
 
 import pytest
@@ -37,13 +38,18 @@ _MODULES = {
 # ---------------------------------------------------------------------------
 
 
+@functools.cache
+def _parse(filepath: Path) -> ast.Module:
+    """Parse a module once and reuse the AST across all structural tests."""
+    return ast.parse(filepath.read_text())
+
+
 def _get_docstring(filepath: Path) -> str:
-    tree = ast.parse(filepath.read_text())
-    return ast.get_docstring(tree) or ""
+    return ast.get_docstring(_parse(filepath)) or ""
 
 
 def _get_imports(filepath: Path) -> set[str]:
-    tree = ast.parse(filepath.read_text())
+    tree = _parse(filepath)
     imports: set[str] = set()
     for node in ast.walk(tree):
         if isinstance(node, ast.Import):
@@ -56,7 +62,7 @@ def _get_imports(filepath: Path) -> set[str]:
 
 def _get_local_imports(filepath: Path) -> set[str]:
     """Return local relative import names (module component after the package)."""
-    tree = ast.parse(filepath.read_text())
+    tree = _parse(filepath)
     imports: set[str] = set()
     for node in ast.walk(tree):
         if isinstance(node, ast.ImportFrom):
@@ -147,6 +153,6 @@ def test_all_modules_parse_without_error() -> None:
     """All source modules must be parseable Python (syntax check)."""
     for name, path in _MODULES.items():
         try:
-            ast.parse(path.read_text())
+            _parse(path)
         except SyntaxError as exc:
             pytest.fail(f"Module '{name}' has a syntax error: {exc}")
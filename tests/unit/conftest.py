@@ -0,0 +1,85 @@
+"""Shared fixtures for the unit test suite.
+
+The FastAPI app and its AsyncClient live here so every HTTP-level test
+shares one session-scoped app. run_id/task_ctx replace the per-class
+setup helpers that used to re-POST the same flow/run/task objects.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import shutil
+import tempfile
+
+import httpx
+import pytest
+
+from metaflow_local_service import store
+from metaflow_local_service.server import create_app
+
+_dir_seq = itertools.count()
+
+
+@pytest.fixture(scope="session")
+def fast_tmp_factory(tmp_path_factory):
+    """mktemp-style factory preferring tmpfs, so test metadata never hits disk.
+
+    /dev/shm is memory-backed on Linux; on other platforms (or restricted
+    sandboxes) this falls back to pytest's regular tmp_path_factory. tmpfs
+    roots are removed at session end — /dev/shm has no reaper of its own.
+    """
+    shm_roots: list[str] = []
+
+    def mktemp(name: str) -> str:
+        if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+            path = tempfile.mkdtemp(prefix=f"{name}-", dir="/dev/shm")
+            shm_roots.append(path)
+            return path
+        return str(tmp_path_factory.mktemp(name))
+
+    yield mktemp
+    for path in shm_roots:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def _server_root(fast_tmp_factory):
+    """One temp root for the whole session; tests get numbered subdirs."""
+    return fast_tmp_factory("server-meta")
+
+
+@pytest.fixture(scope="session")
+def _app(fast_tmp_factory):
+    """Build the app once; create_app() runs store.setup() eagerly."""
+    store.reset_for_tests()
+    yield create_app(fast_tmp_factory("server-root"))
+    store.reset_for_tests()
+
+
+@pytest.fixture()
+async def client(_app, _server_root):
+    """Yield an AsyncClient against the app, with a fresh temp .metaflow/."""
+    # reset_for_tests() repoints LocalStorage without any makedirs: the
+    # provider creates directories lazily on first write, and read paths
+    # tolerate a missing root.
+    store.reset_for_tests(os.path.join(_server_root, str(next(_dir_seq))))
+    transport = httpx.ASGITransport(app=_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest.fixture()
+async def run_id(client):
+    """Create a run for MyFlow (flow auto-created) and return its number."""
+    return (await client.post("/flows/MyFlow/run", json={})).json()["run_number"]
+
+
+@pytest.fixture()
+async def task_ctx(client, run_id):
+    """Create a task under run_id (step auto-created).
+
+    Returns (run_id, step_name, task_id).
+    """
+    resp = await client.post(f"/flows/MyFlow/runs/{run_id}/steps/start/task", json={})
+    return run_id, "start", resp.json()["task_id"]
@@ -20,6 +20,7 @@ def _clean_state(tmp_path, monkeypatch):
         daemon, "_STATE_FILE", str(tmp_path / ".metaflow-local-service" / "state.json")
     )
     monkeypatch.setattr(daemon, "_PID_FILE", str(tmp_path / ".metaflow-local-service" / "pid"))
+    monkeypatch.setattr(daemon, "_dir_ready", False)
 
 
 class TestDaemonState:
@@ -1,39 +1,22 @@
 """Unit tests for the FastAPI server routes.
 
-Uses httpx.AsyncClient (via fastapi.testclient.TestClient) to send HTTP
-requests without starting a real server. All storage is isolated to a
-temp directory by resetting LocalStorage before each test.
+The app, client, and run_id/task_ctx setup fixtures are shared across
+the suite and live in conftest.py. Each test gets isolation by
+repointing LocalStorage at a fresh temp directory and clearing the
+store's in-memory state.
 """
 
 from __future__ import annotations
 
-import os
 
-import pytest
-from fastapi.testclient import TestClient
+def _task_url(run_id: str, task_id: str, step: str = "start") -> str:
+    """Service-API prefix for a task; append /artifacts, /metadata, etc."""
+    return f"/flows/MyFlow/runs/{run_id}/steps/{step}/tasks/{task_id}"
 
-from metaflow_local_service import store
-from metaflow_local_service.server import create_app
 
-
-@pytest.fixture()
-def client(tmp_path):
-    """Return a TestClient backed by a fresh temp .metaflow/ directory."""
-    store._initialized = False
-    store._task_counters.clear()
-
-    from metaflow.plugins.datastores.local_storage import LocalStorage
-
-    metadir = os.path.join(str(tmp_path), ".metaflow")
-    os.makedirs(metadir, exist_ok=True)
-    LocalStorage.datastore_root = metadir
-
-    app = create_app(str(tmp_path))
-    with TestClient(app, raise_server_exceptions=True) as c:
-        yield c
-
-    store._initialized = False
-    store._task_counters.clear()
+def _ui_task_url(run_id: str, task_id: str) -> str:
+    """UI-API (/api/*) prefix for a task."""
+    return f"/api/flows/MyFlow/runs/{run_id}/steps/start/tasks/{task_id}"
 
 
 # ---------------------------------------------------------------------------
@@ -42,12 +25,12 @@ def client(tmp_path):
 
 
 class TestPing:
-    def test_ping_returns_200(self, client):
-        resp = client.get("/ping")
+    async def test_ping_returns_200(self, client):
+        resp = await client.get("/ping")
         assert resp.status_code == 200
 
-    def test_ping_has_version_header(self, client):
-        resp = client.get("/ping")
+    async def test_ping_has_version_header(self, client):
+        resp = await client.get("/ping")
         assert "METADATA_SERVICE_VERSION" in resp.headers
         assert resp.headers["METADATA_SERVICE_VERSION"] == "2.5.0"
 
@@ -58,24 +41,21 @@ class TestPing:
 
 
 class TestFlowRoutes:
-    def test_create_flow(self, client):
-        resp = client.post("/flows/MyFlow", json={})
+    async def test_flow_lifecycle(self, client):
+        """Create, conflict on re-create, then fetch — one shared setup."""
+        resp = await client.post("/flows/MyFlow", json={})
         assert resp.status_code == 201
         assert resp.json()["flow_id"] == "MyFlow"
 
-    def test_create_flow_conflict(self, client):
-        client.post("/flows/MyFlow", json={})
-        resp = client.post("/flows/MyFlow", json={})
+        resp = await client.post("/flows/MyFlow", json={})
         assert resp.status_code == 409
 
-    def test_get_flow(self, client):
-        client.post("/flows/MyFlow", json={})
-        resp = client.get("/flows/MyFlow")
+        resp = await client.get("/flows/MyFlow")
         assert resp.status_code == 200
         assert resp.json()["flow_id"] == "MyFlow"
 
-    def test_get_missing_flow(self, client):
-        resp = client.get("/flows/NoSuchFlow")
+    async def test_get_missing_flow(self, client):
+        resp = await client.get("/flows/NoSuchFlow")
         assert resp.status_code == 404
 
 
@@ -85,30 +65,28 @@ class TestFlowRoutes:
 
 
 class TestRunRoutes:
-    def test_create_run(self, client):
-        resp = client.post("/flows/MyFlow/run", json={"tags": ["t1"]})
+    async def test_run_lifecycle(self, client):
+        """Create two runs, fetch one, then list both."""
+        resp = await client.post("/flows/MyFlow/run", json={"tags": ["t1"]})
         assert resp.status_code == 201
         body = resp.json()
         assert "run_number" in body
         assert body["tags"] == ["t1"]
+        run_number = body["run_number"]
+        await client.post("/flows/MyFlow/run", json={})
 
-    def test_get_run(self, client):
-        run_number = client.post("/flows/MyFlow/run", json={}).json()["run_number"]
-        resp = client.get(f"/flows/MyFlow/runs/{run_number}")
+        resp = await client.get(f"/flows/MyFlow/runs/{run_number}")
         assert resp.status_code == 200
         assert resp.json()["run_number"] == run_number
 
-    def test_get_missing_run(self, client):
-        resp = client.get("/flows/MyFlow/runs/999999")
-        assert resp.status_code == 404
-
-    def test_list_runs(self, client):
-        client.post("/flows/MyFlow/run", json={})
-        client.post("/flows/MyFlow/run", json={})
-        resp = client.get("/flows/MyFlow/runs")
+        resp = await client.get("/flows/MyFlow/runs")
         assert resp.status_code == 200
         assert len(resp.json()) == 2
 
+    async def test_get_missing_run(self, client):
+        resp = await client.get("/flows/MyFlow/runs/999999")
+        assert resp.status_code == 404
+
 
 # ---------------------------------------------------------------------------
 # Step
@@ -116,33 +94,22 @@ class TestRunRoutes:
 
 
 class TestStepRoutes:
-    def _run_id(self, client) -> str:
-        return client.post("/flows/MyFlow/run", json={}).json()["run_number"]
-
-    def test_create_step(self, client):
-        run_id = self._run_id(client)
-        resp = client.post(f"/flows/MyFlow/runs/{run_id}/steps/start/step", json={})
+    async def test_step_lifecycle(self, client, run_id):
+        """Create two steps, conflict on re-create, fetch one, then list both."""
+        url = f"/flows/MyFlow/runs/{run_id}/steps/start/step"
+        resp = await client.post(url, json={})
         assert resp.status_code == 201
         assert resp.json()["step_name"] == "start"
+        resp = await client.post(f"/flows/MyFlow/runs/{run_id}/steps/end/step", json={})
+        assert resp.status_code == 201
 
-    def test_create_step_conflict(self, client):
-        run_id = self._run_id(client)
-        url = f"/flows/MyFlow/runs/{run_id}/steps/start/step"
-        client.post(url, json={})
-        resp = client.post(url, json={})
+        resp = await client.post(url, json={})
         assert resp.status_code == 409
 
-    def test_get_step(self, client):
-        run_id = self._run_id(client)
-        client.post(f"/flows/MyFlow/runs/{run_id}/steps/start/step", json={})
-        resp = client.get(f"/flows/MyFlow/runs/{run_id}/steps/start")
+        resp = await client.get(f"/flows/MyFlow/runs/{run_id}/steps/start")
         assert resp.status_code == 200
 
-    def test_list_steps(self, client):
-        run_id = self._run_id(client)
-        client.post(f"/flows/MyFlow/runs/{run_id}/steps/start/step", json={})
-        client.post(f"/flows/MyFlow/runs/{run_id}/steps/end/step", json={})
-        resp = client.get(f"/flows/MyFlow/runs/{run_id}/steps")
+        resp = await client.get(f"/flows/MyFlow/runs/{run_id}/steps")
         assert len(resp.json()) == 2
 
 
@@ -152,36 +119,19 @@ class TestStepRoutes:
 
 
 class TestTaskRoutes:
-    def _run_id(self, client) -> str:
-        return client.post("/flows/MyFlow/run", json={}).json()["run_number"]
-
-    def test_create_task(self, client):
-        run_id = self._run_id(client)
-        resp = client.post(f"/flows/MyFlow/runs/{run_id}/steps/start/task", json={})
-        assert resp.status_code == 201
-        assert "task_id" in resp.json()
-
-    def test_task_ids_increment(self, client):
-        run_id = self._run_id(client)
+    async def test_task_lifecycle(self, client, run_id):
+        """Create two tasks with increasing IDs, fetch one, then list both."""
         url = f"/flows/MyFlow/runs/{run_id}/steps/start/task"
-        t1 = client.post(url, json={}).json()["task_id"]
-        t2 = client.post(url, json={}).json()["task_id"]
+        resp = await client.post(url, json={})
+        assert resp.status_code == 201
+        t1 = resp.json()["task_id"]
+        t2 = (await client.post(url, json={})).json()["task_id"]
         assert int(t2) > int(t1)
 
-    def test_get_task(self, client):
-        run_id = self._run_id(client)
-        task_id = client.post(f"/flows/MyFlow/runs/{run_id}/steps/start/task", json={}).json()[
-            "task_id"
-        ]
-        resp = client.get(f"/flows/MyFlow/runs/{run_id}/steps/start/tasks/{task_id}")
+        resp = await client.get(_task_url(run_id, t1))
         assert resp.status_code == 200
 
-    def test_list_tasks(self, client):
-        run_id = self._run_id(client)
-        url = f"/flows/MyFlow/runs/{run_id}/steps/start/task"
-        client.post(url, json={})
-        client.post(url, json={})
-        resp = client.get(f"/flows/MyFlow/runs/{run_id}/steps/start/tasks")
+        resp = await client.get(f"/flows/MyFlow/runs/{run_id}/steps/start/tasks")
         assert len(resp.json()) == 2
 
 
@@ -191,22 +141,15 @@ class TestTaskRoutes:
 
 
 class TestHeartbeat:
-    def _run_id(self, client) -> str:
-        return client.post("/flows/MyFlow/run", json={}).json()["run_number"]
-
-    def test_run_heartbeat(self, client):
-        run_id = self._run_id(client)
-        resp = client.post(f"/flows/MyFlow/runs/{run_id}/heartbeat", json={})
+    async def test_run_heartbeat(self, client, run_id):
+        resp = await client.post(f"/flows/MyFlow/runs/{run_id}/heartbeat", json={})
         assert resp.status_code == 200
         assert "wait_time_in_seconds" in resp.json()
 
-    def test_task_heartbeat(self, client):
-        run_id = self._run_id(client)
-        task_id = client.post(f"/flows/MyFlow/runs/{run_id}/steps/start/task", json={}).json()[
-            "task_id"
-        ]
-        resp = client.post(
-            f"/flows/MyFlow/runs/{run_id}/steps/start/tasks/{task_id}/heartbeat",
+    async def test_task_heartbeat(self, client, task_ctx):
+        run_id, _, task_id = task_ctx
+        resp = await client.post(
+            f"{_task_url(run_id, task_id)}/heartbeat",
             json={},
         )
         assert resp.status_code == 200
@@ -219,15 +162,8 @@ class TestHeartbeat:
 
 
 class TestArtifactRoutes:
-    def _task_path(self, client) -> tuple[str, str, str]:
-        run_id = client.post("/flows/MyFlow/run", json={}).json()["run_number"]
-        task_id = client.post(f"/flows/MyFlow/runs/{run_id}/steps/start/task", json={}).json()[
-            "task_id"
-        ]
-        return run_id, "start", task_id
-
-    def test_register_and_list_artifacts(self, client):
-        run_id, step, task_id = self._task_path(client)
+    async def test_register_and_list_artifacts(self, client, task_ctx):
+        run_id, step, task_id = task_ctx
         artifacts = [
             {
                 "name": "x",
@@ -239,13 +175,13 @@ class TestArtifactRoutes:
                 "type": "metaflow.artifact",
             }
         ]
-        resp = client.post(
-            f"/flows/MyFlow/runs/{run_id}/steps/{step}/tasks/{task_id}/artifact",
+        resp = await client.post(
+            f"{_task_url(run_id, task_id, step)}/artifact",
             json=artifacts,
         )
         assert resp.status_code == 200
 
-        resp = client.get(f"/flows/MyFlow/runs/{run_id}/steps/{step}/tasks/{task_id}/artifacts")
+        resp = await client.get(f"{_task_url(run_id, task_id, step)}/artifacts")
         assert resp.status_code == 200
         assert len(resp.json()) == 1
 
@@ -256,23 +192,16 @@ class TestArtifactRoutes:
 
 
 class TestMetadataRoutes:
-    def _task_path(self, client) -> tuple[str, str, str]:
-        run_id = client.post("/flows/MyFlow/run", json={}).json()["run_number"]
-        task_id = client.post(f"/flows/MyFlow/runs/{run_id}/steps/start/task", json={}).json()[
-            "task_id"
-        ]
-        return run_id, "start", task_id
-
-    def test_register_and_get_metadata(self, client):
-        run_id, step, task_id = self._task_path(client)
+    async def test_register_and_get_metadata(self, client, task_ctx):
+        run_id, step, task_id = task_ctx
         entries = [{"field_name": "runtime", "value": "python", "type": "runtime", "tags": []}]
-        resp = client.post(
-            f"/flows/MyFlow/runs/{run_id}/steps/{step}/tasks/{task_id}/metadata",
+        resp = await client.post(
+            f"{_task_url(run_id, task_id, step)}/metadata",
             json=entries,
         )
         assert resp.status_code == 200
 
-        resp = client.get(f"/flows/MyFlow/runs/{run_id}/steps/{step}/tasks/{task_id}/metadata")
+        resp = await client.get(f"{_task_url(run_id, task_id, step)}/metadata")
         assert resp.status_code == 200
         fields = {m["field_name"] for m in resp.json()}
         assert "runtime" in fields
@@ -284,10 +213,12 @@ class TestMetadataRoutes:
 
 
 class TestTagMutationRoutes:
-    def test_add_tags(self, client):
-        run_id = client.post("/flows/MyFlow/run", json={"tags": ["existing"]}).json()["run_number"]
+    async def test_add_tags(self, client):
+        run_id = (await client.post("/flows/MyFlow/run", json={"tags": ["existing"]})).json()[
+            "run_number"
+        ]
 
-        resp = client.patch(
+        resp = await client.patch(
             f"/flows/MyFlow/runs/{run_id}/tag/mutate",
             json={"tags_to_add": ["new"], "tags_to_remove": []},
         )
@@ -303,14 +234,12 @@ class TestTagMutationRoutes:
 
 
 class TestMissing404Routes:
-    def test_get_missing_step(self, client):
-        run_id = client.post("/flows/MyFlow/run", json={}).json()["run_number"]
-        resp = client.get(f"/flows/MyFlow/runs/{run_id}/steps/nosuchstep")
+    async def test_get_missing_step(self, client, run_id):
+        resp = await client.get(f"/flows/MyFlow/runs/{run_id}/steps/nosuchstep")
         assert resp.status_code == 404
 
-    def test_get_missing_task(self, client):
-        run_id = client.post("/flows/MyFlow/run", json={}).json()["run_number"]
-        resp = client.get(f"/flows/MyFlow/runs/{run_id}/steps/start/tasks/9999")
+    async def test_get_missing_task(self, client, run_id):
+        resp = await client.get(f"/flows/MyFlow/runs/{run_id}/steps/start/tasks/9999")
         assert resp.status_code == 404
 
 
@@ -320,11 +249,8 @@ class TestMissing404Routes:
 
 
 class TestArtifactsByAttempt:
-    def test_list_artifacts_for_attempt(self, client):
-        run_id = client.post("/flows/MyFlow/run", json={}).json()["run_number"]
-        task_id = client.post(f"/flows/MyFlow/runs/{run_id}/steps/start/task", json={}).json()[
-            "task_id"
-        ]
+    async def test_list_artifacts_for_attempt(self, client, task_ctx):
+        run_id, _, task_id = task_ctx
         artifact = {
             "name": "x",
             "attempt_id": 0,
@@ -334,13 +260,11 @@ class TestArtifactsByAttempt:
             "content_type": "pickle",
             "type": "metaflow.artifact",
         }
-        client.post(
-            f"/flows/MyFlow/runs/{run_id}/steps/start/tasks/{task_id}/artifact",
+        await client.post(
+            f"{_task_url(run_id, task_id)}/artifact",
             json=[artifact],
         )
-        resp = client.get(
-            f"/flows/MyFlow/runs/{run_id}/steps/start/tasks/{task_id}/attempt/0/artifacts"
-        )
+        resp = await client.get(f"{_task_url(run_id, task_id)}/attempt/0/artifacts")
         assert resp.status_code == 200
         assert len(resp.json()) == 1
 
@@ -351,9 +275,8 @@ class TestArtifactsByAttempt:
 
 
 class TestFilteredTasks:
-    def test_filtered_tasks_returns_list(self, client):
-        run_id = client.post("/flows/MyFlow/run", json={}).json()["run_number"]
-        resp = client.get(
+    async def test_filtered_tasks_returns_list(self, client, run_id):
+        resp = await client.get(
             f"/flows/MyFlow/runs/{run_id}/steps/start/filtered_tasks",
             params={"metadata_field_name": "runtime", "pattern": ".*"},
         )
@@ -369,203 +292,190 @@ class TestFilteredTasks:
 class TestUIRoutes:
     """Covers all /api/* endpoints added for Metaflow UI compatibility."""
 
-    def _setup(self, client) -> tuple[str, str]:
-        """Create flow, run, step, and task. Returns (run_id, task_id)."""
-        client.post("/flows/MyFlow", json={})
-        run_id = client.post("/flows/MyFlow/run", json={}).json()["run_number"]
-        client.post(f"/flows/MyFlow/runs/{run_id}/steps/start/step", json={})
-        task_id = client.post(f"/flows/MyFlow/runs/{run_id}/steps/start/task", json={}).json()[
-            "task_id"
-        ]
-        return run_id, task_id
-
-    def test_ui_ping(self, client):
-        resp = client.get("/api/ping")
+    async def test_ui_ping(self, client):
+        resp = await client.get("/api/ping")
         assert resp.status_code == 200
         assert "version" in resp.json()
 
-    def test_ui_list_flows(self, client):
-        client.post("/flows/MyFlow", json={})
-        resp = client.get("/api/flows")
+    async def test_ui_list_flows(self, client):
+        await client.post("/flows/MyFlow", json={})
+        resp = await client.get("/api/flows")
         assert resp.status_code == 200
         assert "data" in resp.json()
 
-    def test_ui_get_flow(self, client):
-        client.post("/flows/MyFlow", json={})
-        resp = client.get("/api/flows/MyFlow")
+    async def test_ui_get_flow(self, client):
+        await client.post("/flows/MyFlow", json={})
+        resp = await client.get("/api/flows/MyFlow")
         assert resp.status_code == 200
         assert resp.json()["data"]["flow_id"] == "MyFlow"
 
-    def test_ui_get_flow_not_found(self, client):
-        resp = client.get("/api/flows/NoSuchFlow")
+    async def test_ui_get_flow_not_found(self, client):
+        resp = await client.get("/api/flows/NoSuchFlow")
         assert resp.status_code == 404
 
-    def test_ui_list_all_runs(self, client):
-        self._setup(client)
-        resp = client.get("/api/runs")
+    async def test_ui_list_all_runs(self, client, task_ctx):
+        resp = await client.get("/api/runs")
         assert resp.status_code == 200
         assert "data" in resp.json()
 
-    def test_ui_list_runs_for_flow(self, client):
-        _, _ = self._setup(client)
-        resp = client.get("/api/flows/MyFlow/runs")
+    async def test_ui_list_runs_for_flow(self, client, task_ctx):
+        resp = await client.get("/api/flows/MyFlow/runs")
         assert resp.status_code == 200
         assert "data" in resp.json()
 
-    def test_ui_get_run(self, client):
-        run_id, _ = self._setup(client)
-        resp = client.get(f"/api/flows/MyFlow/runs/{run_id}")
+    async def test_ui_get_run(self, client, task_ctx):
+        run_id, _, _ = task_ctx
+        resp = await client.get(f"/api/flows/MyFlow/runs/{run_id}")
         assert resp.status_code == 200
         assert resp.json()["data"]["run_number"] == run_id
 
-    def test_ui_get_run_not_found(self, client):
-        resp = client.get("/api/flows/MyFlow/runs/9999999")
+    async def test_ui_get_run_not_found(self, client):
+        resp = await client.get("/api/flows/MyFlow/runs/9999999")
         assert resp.status_code == 404
 
-    def test_ui_list_all_tasks_for_run(self, client):
-        run_id, _ = self._setup(client)
-        resp = client.get(f"/api/flows/MyFlow/runs/{run_id}/tasks")
+    async def test_ui_list_all_tasks_for_run(self, client, task_ctx):
+        run_id, _, _ = task_ctx
+        resp = await client.get(f"/api/flows/MyFlow/runs/{run_id}/tasks")
         assert resp.status_code == 200
         assert "data" in resp.json()
 
-    def test_ui_run_artifacts(self, client):
-        run_id, _ = self._setup(client)
-        resp = client.get(f"/api/flows/MyFlow/runs/{run_id}/artifacts")
+    async def test_ui_run_artifacts(self, client, task_ctx):
+        run_id, _, _ = task_ctx
+        resp = await client.get(f"/api/flows/MyFlow/runs/{run_id}/artifacts")
         assert resp.status_code == 200
         assert resp.json()["data"] == []
 
-    def test_ui_list_steps(self, client):
-        run_id, _ = self._setup(client)
-        resp = client.get(f"/api/flows/MyFlow/runs/{run_id}/steps")
+    async def test_ui_list_steps(self, client, task_ctx):
+        run_id, _, _ = task_ctx
+        resp = await client.get(f"/api/flows/MyFlow/runs/{run_id}/steps")
         assert resp.status_code == 200
         assert "data" in resp.json()
 
-    def test_ui_get_step(self, client):
-        run_id, _ = self._setup(client)
-        resp = client.get(f"/api/flows/MyFlow/runs/{run_id}/steps/start")
+    async def test_ui_get_step(self, client, task_ctx):
+        run_id, _, _ = task_ctx
+        resp = await client.get(f"/api/flows/MyFlow/runs/{run_id}/steps/start")
         assert resp.status_code == 200
         assert resp.json()["data"]["step_name"] == "start"
 
-    def test_ui_get_step_not_found(self, client):
-        run_id, _ = self._setup(client)
-        resp = client.get(f"/api/flows/MyFlow/runs/{run_id}/steps/nosuchstep")
+    async def test_ui_get_step_not_found(self, client, task_ctx):
+        run_id, _, _ = task_ctx
+        resp = await client.get(f"/api/flows/MyFlow/runs/{run_id}/steps/nosuchstep")
         assert resp.status_code == 404
 
-    def test_ui_list_tasks(self, client):
-        run_id, _ = self._setup(client)
-        resp = client.get(f"/api/flows/MyFlow/runs/{run_id}/steps/start/tasks")
+    async def test_ui_list_tasks(self, client, task_ctx):
+        run_id, _, _ = task_ctx
+        resp = await client.get(f"/api/flows/MyFlow/runs/{run_id}/steps/start/tasks")
         assert resp.status_code == 200
         assert "data" in resp.json()
 
-    def test_ui_get_task(self, client):
-        run_id, task_id = self._setup(client)
-        resp = client.get(f"/api/flows/MyFlow/runs/{run_id}/steps/start/tasks/{task_id}")
+    async def test_ui_get_task(self, client, task_ctx):
+        run_id, _, task_id = task_ctx
+        resp = await client.get(_ui_task_url(run_id, task_id))
         assert resp.status_code == 200
         assert resp.json()["data"]["task_id"] == task_id
 
-    def test_ui_get_task_not_found(self, client):
-        run_id, _ = self._setup(client)
-        resp = client.get(f"/api/flows/MyFlow/runs/{run_id}/steps/start/tasks/9999")
+    async def test_ui_get_task_not_found(self, client, task_ctx):
+        run_id, _, _ = task_ctx
+        resp = await client.get(f"/api/flows/MyFlow/runs/{run_id}/steps/start/tasks/9999")
         assert resp.status_code == 404
 
-    def test_ui_task_attempts(self, client):
-        run_id, task_id = self._setup(client)
-        resp = client.get(f"/api/flows/MyFlow/runs/{run_id}/steps/start/tasks/{task_id}/attempts")
+    async def test_ui_task_attempts(self, client, task_ctx):
+        run_id, _, task_id = task_ctx
+        resp = await client.get(f"{_ui_task_url(run_id, task_id)}/attempts")
         assert resp.status_code == 200
         assert isinstance(resp.json()["data"], list)
 
-    def test_ui_task_attempts_missing_task(self, client):
-        run_id, _ = self._setup(client)
-        resp = client.get(f"/api/flows/MyFlow/runs/{run_id}/steps/start/tasks/9999/attempts")
+    async def test_ui_task_attempts_missing_task(self, client, task_ctx):
+        run_id, _, _ = task_ctx
+        resp = await client.get(f"/api/flows/MyFlow/runs/{run_id}/steps/start/tasks/9999/attempts")
         assert resp.status_code == 200
         assert resp.json()["data"] == []
 
-    def test_ui_task_metadata(self, client):
-        run_id, task_id = self._setup(client)
-        resp = client.get(f"/api/flows/MyFlow/runs/{run_id}/steps/start/tasks/{task_id}/metadata")
+    async def test_ui_task_metadata(self, client, task_ctx):
+        run_id, _, task_id = task_ctx
+        resp = await client.get(f"{_ui_task_url(run_id, task_id)}/metadata")
         assert resp.status_code == 200
         assert "data" in resp.json()
 
-    def test_ui_task_artifacts(self, client):
-        run_id, task_id = self._setup(client)
-        resp = client.get(f"/api/flows/MyFlow/runs/{run_id}/steps/start/tasks/{task_id}/artifacts")
+    async def test_ui_task_artifacts(self, client, task_ctx):
+        run_id, _, task_id = task_ctx
+        resp = await client.get(f"{_ui_task_url(run_id, task_id)}/artifacts")
         assert resp.status_code == 200
         assert "data" in resp.json()
 
-    def test_ui_task_artifacts_with_attempt_id(self, client):
-        run_id, task_id = self._setup(client)
-        resp = client.get(
-            f"/api/flows/MyFlow/runs/{run_id}/steps/start/tasks/{task_id}/artifacts",
+    async def test_ui_task_artifacts_with_attempt_id(self, client, task_ctx):
+        run_id, _, task_id = task_ctx
+        resp = await client.get(
+            f"{_ui_task_url(run_id, task_id)}/artifacts",
             params={"attempt_id": "0"},
         )
         assert resp.status_code == 200
 
-    def test_ui_task_cards(self, client):
-        run_id, task_id = self._setup(client)
-        resp = client.get(f"/api/flows/MyFlow/runs/{run_id}/steps/start/tasks/{task_id}/cards")
+    async def test_ui_task_cards(self, client, task_ctx):
+        run_id, _, task_id = task_ctx
+        resp = await client.get(f"{_ui_task_url(run_id, task_id)}/cards")
         assert resp.status_code == 200
         assert resp.json()["data"] == []
 
-    def test_ui_task_log_out(self, client):
-        run_id, task_id = self._setup(client)
-        resp = client.get(f"/api/flows/MyFlow/runs/{run_id}/steps/start/tasks/{task_id}/logs/out")
+    async def test_ui_task_log_out(self, client, task_ctx):
+        run_id, _, task_id = task_ctx
+        resp = await client.get(f"{_ui_task_url(run_id, task_id)}/logs/out")
         assert resp.status_code == 200
 
-    def test_ui_task_log_err(self, client):
-        run_id, task_id = self._setup(client)
-        resp = client.get(f"/api/flows/MyFlow/runs/{run_id}/steps/start/tasks/{task_id}/logs/err")
+    async def test_ui_task_log_err(self, client, task_ctx):
+        run_id, _, task_id = task_ctx
+        resp = await client.get(f"{_ui_task_url(run_id, task_id)}/logs/err")
         assert resp.status_code == 200
 
-    def test_ui_run_parameters(self, client):
-        run_id, _ = self._setup(client)
-        resp = client.get(f"/api/flows/MyFlow/runs/{run_id}/parameters")
+    async def test_ui_run_parameters(self, client, task_ctx):
+        run_id, _, _ = task_ctx
+        resp = await client.get(f"/api/flows/MyFlow/runs/{run_id}/parameters")
         assert resp.status_code == 200
         assert resp.json()["data"] == []
 
-    def test_ui_run_metadata(self, client):
-        run_id, _ = self._setup(client)
-        resp = client.get(f"/api/flows/MyFlow/runs/{run_id}/metadata")
+    async def test_ui_run_metadata(self, client, task_ctx):
+        run_id, _, _ = task_ctx
+        resp = await client.get(f"/api/flows/MyFlow/runs/{run_id}/metadata")
         assert resp.status_code == 200
         assert resp.json()["data"] == []
 
-    def test_ui_run_dag(self, client):
-        run_id, _ = self._setup(client)
-        resp = client.get(f"/api/flows/MyFlow/runs/{run_id}/dag")
+    async def test_ui_run_dag(self, client, task_ctx):
+        run_id, _, _ = task_ctx
+        resp = await client.get(f"/api/flows/MyFlow/runs/{run_id}/dag")
         assert resp.status_code == 200
         dag = resp.json()["data"]
         assert "steps" in dag
         assert "graph_structure" in dag
 
-    def test_ui_run_dag_empty(self, client):
-        run_id = client.post("/flows/MyFlow/run", json={}).json()["run_number"]
-        resp = client.get(f"/api/flows/MyFlow/runs/{run_id}/dag")
+    async def test_ui_run_dag_empty(self, client, run_id):
+        resp = await client.get(f"/api/flows/MyFlow/runs/{run_id}/dag")
         assert resp.status_code == 200
 
-    def test_ui_features(self, client):
-        resp = client.get("/api/features")
+    async def test_ui_features(self, client):
+        resp = await client.get("/api/features")
         assert resp.status_code == 200
         assert resp.json() == {}
 
-    def test_ui_plugins(self, client):
-        resp = client.get("/api/plugin")
+    async def test_ui_plugins(self, client):
+        resp = await client.get("/api/plugin")
         assert resp.status_code == 200
         assert resp.json() == []
 
-    def test_ui_links(self, client):
-        resp = client.get("/api/links")
+    async def test_ui_links(self, client):
+        resp = await client.get("/api/links")
         assert resp.status_code == 200
         assert resp.json() == []
 
-    def test_ui_version(self, client):
-        resp = client.get("/api/version")
+    async def test_ui_version(self, client):
+        resp = await client.get("/api/version")
         assert resp.status_code == 200
         assert resp.text == "2.5.0"
 
-    def test_ui_notifications(self, client):
-        resp = client.get("/api/notifications")
+    async def test_ui_notifications(self, client):
+        resp = await client.get("/api/notifications")
         assert resp.status_code == 200
         assert resp.json()["data"] == []
 
-    def test_ui_artifacts_autocomplete(self, client):
-        resp = client.get("/api/artifacts/autocomplete")
+    async def test_ui_artifacts_autocomplete(self, client):
+        resp = await client.get("/api/artifacts/autocomplete")
         assert resp.status_code == 200
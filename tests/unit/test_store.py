@@ -6,40 +6,41 @@ from the user's real metadata and from each other.
 
 from __future__ import annotations
 
+import itertools
+import json
 import os
+import threading
+import time
 
 import pytest
+from metaflow.plugins.datastores.local_storage import LocalStorage
 
 from metaflow_local_service import store
 
+_dir_seq = itertools.count()
 
-@pytest.fixture(autouse=True)
-def _isolated_metaflow(tmp_path):
-    """Point LocalStorage at a fresh temp directory for every test."""
-    # Reset the store's initialized flag so setup() runs fresh each test.
-    store._initialized = False
-    store._task_counters.clear()
-
-    store.setup(str(tmp_path))
 
-    # Also reset the LocalStorage datastore_root so the local provider
-    # is pointed at our temp dir.
-    from metaflow.plugins.datastores.local_storage import LocalStorage
+@pytest.fixture(scope="session")
+def _store_root(fast_tmp_factory):
+    """One temp root for the whole session; tests get numbered subdirs."""
+    return fast_tmp_factory("mfstore")
 
-    metadir = os.path.join(str(tmp_path), ".metaflow")
-    os.makedirs(metadir, exist_ok=True)
-    LocalStorage.datastore_root = metadir
 
+@pytest.fixture(autouse=True)
+def _isolated_metaflow(_store_root):
+    """Point the store at a fresh subdirectory for every test.
+
+    reset_for_tests() clears every in-memory cache and repoints the
+    datastore root in one call — once the store is initialized there is no
+    filesystem work left between tests.
+    """
+    store.reset_for_tests(os.path.join(_store_root, str(next(_dir_seq))))
     yield
 
-    # Cleanup: reset for safety
-    store._initialized = False
-    store._task_counters.clear()
-
 
 class TestSetup:
     def test_creates_metaflow_dir(self, tmp_path):
-        store._initialized = False
+        store.reset_for_tests()
         new_root = tmp_path / "new_project"
         new_root.mkdir()
         store.setup(str(new_root))
@@ -56,13 +57,10 @@ class TestRunId:
         run_id = store.new_run_id()
         assert run_id.isdigit()
 
-    def test_monotonically_increases(self):
-        ids = [int(store.new_run_id()) for _ in range(5)]
-        assert ids == sorted(ids)
-
-    def test_unique(self):
-        ids = {store.new_run_id() for _ in range(20)}
-        assert len(ids) == 20
+    def test_monotonic_and_unique(self):
+        """Strict increase over one large batch implies uniqueness too."""
+        ids = [int(store.new_run_id()) for _ in range(1000)]
+        assert all(a < b for a, b in zip(ids, ids[1:]))
 
 
 class TestFlow:
@@ -181,6 +179,32 @@ class TestTask:
         task = store.create_task("MyFlow", run_id, "start", {})
         assert int(task["task_id"]) == 4
 
+    def test_counter_file_never_moves_backwards(self):
+        """Concurrent allocation must never persist a stale (lower) counter value.
+
+        Allocation is lock-free, so threads can reach _persist_task_counter out
+        of order; if a slower thread won the last write, a restart would reseed
+        below the highest issued ID and reissue it.
+        """
+        run_id = self._setup_run()
+        issued: list[int] = []
+
+        def allocate() -> None:
+            for _ in range(25):
+                issued.append(int(store._next_task_id("MyFlow", run_id)))
+
+        threads = [threading.Thread(target=allocate) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(set(issued)) == len(issued)
+        path = store._counter_file("MyFlow", run_id)
+        assert path is not None
+        with open(path) as f:
+            assert int(f.read()) == max(issued)
+
 
 class TestArtifacts:
     def _setup(self) -> tuple[str, str]:
@@ -190,22 +214,25 @@ class TestArtifacts:
         return run_id, task["task_id"]
 
     def test_register_and_get_artifacts(self):
+        """Empty before registration; one batched call registers both."""
         run_id, task_id = self._setup()
+        assert store.get_artifacts("MyFlow", run_id, "start", task_id) == []
+
         artifacts = [
             {
-                "name": "my_var",
+                "name": name,
                 "attempt_id": 0,
-                "sha": "abc123",
+                "sha": f"sha-{name}",
                 "ds_type": "local",
                 "location": "/tmp/x",
                 "content_type": "pickle",
                 "type": "metaflow.artifact",
             }
+            for name in ("my_var", "other_var")
         ]
         store.register_artifacts("MyFlow", run_id, "start", task_id, artifacts)
         result = store.get_artifacts("MyFlow", run_id, "start", task_id)
-        assert len(result) == 1
-        assert result[0]["name"] == "my_var"
+        assert {a["name"] for a in result} == {"my_var", "other_var"}
 
     def test_get_artifacts_for_attempt(self):
         run_id, task_id = self._setup()
@@ -230,10 +257,6 @@ class TestArtifacts:
         result = store.get_artifacts("MyFlow", run_id, "start", task_id, attempt=1)
         assert all(a.get("sha") == "sha1" for a in result)
 
-    def test_empty_artifacts(self):
-        run_id, task_id = self._setup()
-        assert store.get_artifacts("MyFlow", run_id, "start", task_id) == []
-
 
 class TestMetadata:
     def _setup(self) -> tuple[str, str]:
@@ -243,34 +266,99 @@ class TestMetadata:
         return run_id, task["task_id"]
 
     def test_register_and_get_metadata(self):
+        """Empty before registration; one batched call registers all fields."""
         run_id, task_id = self._setup()
-        metadata = [
+        assert store.get_metadata("MyFlow", run_id, "start", task_id) == []
+
+        entries = [
             {
                 "field_name": "runtime",
                 "value": "python",
                 "type": "runtime",
                 "tags": ["attempt_id:0"],
-            }
-        ]
-        store.register_metadata("MyFlow", run_id, "start", task_id, metadata)
-        result = store.get_metadata("MyFlow", run_id, "start", task_id)
-        fields = {m["field_name"] for m in result}
-        assert "runtime" in fields
-
-    def test_multiple_metadata_fields(self):
-        run_id, task_id = self._setup()
-        entries = [
+            },
             {"field_name": "a", "value": "1", "type": "t", "tags": []},
             {"field_name": "b", "value": "2", "type": "t", "tags": []},
         ]
         store.register_metadata("MyFlow", run_id, "start", task_id, entries)
         result = store.get_metadata("MyFlow", run_id, "start", task_id)
         fields = {m["field_name"] for m in result}
-        assert {"a", "b"} <= fields
+        assert {"runtime", "a", "b"} <= fields
+
+
+class TestWriteBuffer:
+    def _setup(self) -> tuple[str, str]:
+        run = store.create_run("MyFlow", {})
+        run_id = run["run_number"]
+        task = store.create_task("MyFlow", run_id, "start", {})
+        return run_id, task["task_id"]
 
-    def test_empty_metadata(self):
+    def _register(self, run_id: str, task_id: str, field: str) -> None:
+        store.register_metadata(
+            "MyFlow",
+            run_id,
+            "start",
+            task_id,
+            [{"field_name": field, "value": "1", "type": "t", "tags": []}],
+        )
+
+    def test_flush_drains_queue(self, monkeypatch):
         run_id, task_id = self._setup()
-        assert store.get_metadata("MyFlow", run_id, "start", task_id) == []
+        monkeypatch.setattr(store, "_FLUSH_DELAY_SECONDS", 60.0)
+        self._register(run_id, task_id, "buffered")
+        assert store._pending_meta
+        store.flush()
+        assert store._pending_meta == {}
+        store.flush()  # idle flush is a no-op
+        fields = {m["field_name"] for m in store.get_metadata("MyFlow", run_id, "start", task_id)}
+        assert "buffered" in fields
+
+    def test_read_waits_for_inflight_flush(self, monkeypatch):
+        """A read racing the timer flush must still see the acknowledged write.
+
+        Slowing _save_meta keeps the timer thread mid-write when the read-path
+        flush() runs; without the I/O lock the reader would see an empty queue
+        and return before the record is on disk.
+        """
+        run_id, task_id = self._setup()
+        store.flush()  # drain the setup records before arming the timer
+        provider = store._local()
+        real_save = provider._save_meta
+
+        def slow_save(meta_dir: str, items: dict) -> None:
+            time.sleep(0.05)
+            real_save(meta_dir, items)
+
+        monkeypatch.setattr(provider, "_save_meta", slow_save)
+        self._register(run_id, task_id, "raced")
+        time.sleep(4 * store._FLUSH_DELAY_SECONDS)  # let the timer enter slow_save
+        fields = {m["field_name"] for m in store.get_metadata("MyFlow", run_id, "start", task_id)}
+        assert "raced" in fields
+
+    def test_failed_flush_requeues_records(self, monkeypatch):
+        """Records whose write fails go back on the queue instead of vanishing."""
+        provider = store._local()
+        real_save = provider._save_meta
+        failures = iter([OSError("disk full")])
+
+        def flaky_save(meta_dir: str, items: dict) -> None:
+            error = next(failures, None)
+            if error is not None:
+                raise error
+            real_save(meta_dir, items)
+
+        run_id, task_id = self._setup()
+        store.flush()
+        # Keep the timer out of the picture so only the manual flush below
+        # hits the one-shot failure.
+        monkeypatch.setattr(store, "_FLUSH_DELAY_SECONDS", 60.0)
+        self._register(run_id, task_id, "retried")
+        monkeypatch.setattr(provider, "_save_meta", flaky_save)
+        with pytest.raises(OSError):
+            store.flush()
+        assert store._pending_meta  # still queued after the failure
+        fields = {m["field_name"] for m in store.get_metadata("MyFlow", run_id, "start", task_id)}
+        assert "retried" in fields
 
 
 class TestTagMutation:
@@ -331,18 +419,11 @@ class TestEnrichTask:
         return run_id, task["task_id"]
 
     def _meta_dir(self, flow: str, run_id: str, task_id: str) -> str:
-        import os
-
-        from metaflow.plugins.datastores.local_storage import LocalStorage
-
         return os.path.join(
             str(LocalStorage.datastore_root), flow, run_id, "start", task_id, "_meta"
         )
 
     def _write_sysmeta(self, meta_dir: str, field_name: str, value: str, ts: int) -> None:
-        import json
-        import os
-
         fname = f"sysmeta_{field_name}_{ts}.json"
         with open(os.path.join(meta_dir, fname), "w") as f:
             json.dump({"field_name": field_name, "value": value, "ts_epoch": ts}, f)